@@ -93,15 +93,15 @@ class BreakthroughDetector:
         proof_steps = proof_result.get("proof_steps", [])
         theorem = proof_result.get("theorem", "")
         
-        # Red flags for trivial proofs
-        trivial_indicators = [
-            "True := by sorry" in theorem,
-            "apply trivial" in str(proof_steps),
-            len(proof_steps) <= 1,
-            "sorry" in theorem.lower(),
-            theorem.count("True") > theorem.count("=")
-        ]
-        return any(trivial_indicators)
+        # Red flags for trivial proofs (cheapest checks first, stop at the first hit).
+        # Steps are scanned individually rather than through str(proof_steps).
+        return (
+            len(proof_steps) <= 1 or
+            "True := by sorry" in theorem or
+            "sorry" in theorem.lower() or
+            theorem.count("True") > theorem.count("=") or
+            any("apply trivial" in str(step) for step in proof_steps)
+        )
     
     def _matches_target_problem(self, statement: str, patterns: List[str]) -> bool:
         """Check if statement addresses target problem"""
@@ -8,6 +8,13 @@ import re
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+_MAX_CACHED_VERDICTS = 4096
+
 class ContentFilter:
     """
     Advanced content filtering system to maintain high-quality mathematical knowledge
@@ -62,6 +69,7 @@ class ContentFilter:
             r"New fact:$",
             r"^\([0-9]+\)\.$",  # Just numbered items
         ]
+        self._noise_res = [(pattern, re.compile(pattern, re.IGNORECASE)) for pattern in self.noise_patterns]
         
         # Mathematical relevance keywords (use config-specific keywords if provided)
         default_math_keywords = [
@@ -74,6 +82,7 @@ class ContentFilter:
         # Use domain_keywords from config if available, fall back to math_keywords, then default
         self.math_keywords = (self.config.get("domain_keywords") or 
                             self.config.get("math_keywords", default_math_keywords))
+        self._keyword_automaton = self._build_keyword_automaton(self.math_keywords)
         
         # Content categories for filtering
         self.content_categories = {
@@ -84,6 +93,9 @@ class ContentFilter:
             "noise": 0.0
         }
         
+        # (text, content_type) -> should_keep_content verdict; LLMs often repeat themselves
+        self._verdicts: Dict[Tuple[str, str], Tuple[bool, str]] = {}
+        
         self.filter_stats = {
             "facts_removed": 0,
             "ideas_removed": 0,
@@ -93,12 +105,30 @@ class ContentFilter:
             "total_content_after": 0
         }
     
+    @staticmethod
+    def _build_keyword_automaton(keywords: List[str]):
+        """Aho-Corasick automaton over the keywords (None if pyahocorasick is unavailable)"""
+        if ahocorasick is None or not keywords:
+            return None
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def count_math_keywords(self, text_lower: str) -> int:
+        """Number of distinct mathematical keywords occurring in already-lowercased text"""
+        if self._keyword_automaton is not None:
+            # Single pass over the text for all keywords
+            return len({keyword for _, keyword in self._keyword_automaton.iter(text_lower)})
+        return sum(1 for keyword in self.math_keywords if keyword in text_lower)
+    
     def calculate_mathematical_relevance(self, text: str) -> float:
         """Calculate how mathematically relevant content is (0.0 to 1.0)"""
         text_lower = text.lower()
         
         # Count mathematical keywords
-        math_score = sum(1 for keyword in self.math_keywords if keyword in text_lower)
+        math_score = self.count_math_keywords(text_lower)
         max_possible = len(self.math_keywords)
         keyword_ratio = min(math_score / 5.0, 1.0)  # Normalize to max 5 keywords
         
@@ -118,8 +148,8 @@ class ContentFilter:
     
     def is_noise_content(self, text: str) -> Tuple[bool, str]:
         """Check if content matches noise patterns"""
-        for pattern in self.noise_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern, compiled in self._noise_res:
+            if compiled.search(text):
                 return True, f"Matches noise pattern: {pattern}"
         return False, ""
     
@@ -128,7 +158,7 @@ class ContentFilter:
         text_lower = text.lower()
         
         # Check for mathematical content
-        math_keywords_found = sum(1 for kw in self.math_keywords if kw in text_lower)
+        math_keywords_found = self.count_math_keywords(text_lower)
         if math_keywords_found >= 2:
             return "mathematical"
         
@@ -150,15 +180,20 @@ class ContentFilter:
         return "general_programming"
     
     def should_keep_content(self, text: str, content_type: str) -> Tuple[bool, str]:
-        """Determine if content should be kept"""
+        """Determine if content should be kept (verdicts are memoized per text and type)"""
+        key = (text, content_type)
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            if len(self._verdicts) >= _MAX_CACHED_VERDICTS:
+                self._verdicts.clear()
+            verdict = self._verdicts[key] = self._evaluate_content(text, content_type)
+        return verdict
+    
+    def _evaluate_content(self, text: str, content_type: str) -> Tuple[bool, str]:
+        """Run the filter checks, cheapest first"""
         if not text or not text.strip():
             return False, "Empty content"
             
-        # Check noise patterns first
-        is_noise, noise_reason = self.is_noise_content(text)
-        if is_noise:
-            return False, noise_reason
-            
         # Check length constraints
         if content_type == "fact":
             if len(text) < self.quality_thresholds["min_fact_length"]:
@@ -171,6 +206,11 @@ class ContentFilter:
             if len(text) > self.quality_thresholds["max_idea_length"]:
                 return False, f"Idea too long: {len(text)} chars"
         
+        # Check noise patterns
+        is_noise, noise_reason = self.is_noise_content(text)
+        if is_noise:
+            return False, noise_reason
+        
         # Check mathematical relevance
         relevance = self.calculate_mathematical_relevance(text)
         if relevance < self.config["min_mathematical_relevance"]:
@@ -238,7 +278,8 @@ class ContentFilter:
                 continue
                 
             # Keep only substantial mathematical proofs
-            if len(proof) > 50 and any(kw in proof.lower() for kw in ["proof:", "theorem", "complexity", "algorithm"]):
+            proof_lower = proof.lower()
+            if len(proof) > 50 and any(kw in proof_lower for kw in ["proof:", "theorem", "complexity", "algorithm"]):
                 cleaned_proofs.append(proof)
             else:
                 removal_log.append({
@@ -255,13 +296,15 @@ class ContentFilter:
         """Filter reflections to keep only meaningful mathematical insights"""
         cleaned_reflections = []
         removal_log = []
+        top_keywords = self.math_keywords[:10]  # Top 10 math keywords
         
         for i, reflection in enumerate(reflections):
             if isinstance(reflection, dict) and "insight" in reflection:
                 insight = reflection["insight"]
+                insight_lower = insight.lower()
                 
                 # Remove very short or nonsensical insights
-                if len(insight) < 20 or insight.startswith("#") or "neural networks" in insight.lower():
+                if len(insight) < 20 or insight.startswith("#") or "neural networks" in insight_lower:
                     removal_log.append({
                         "index": i,
                         "content": insight,
@@ -272,7 +315,7 @@ class ContentFilter:
                     continue
                 
                 # Keep mathematical insights
-                if any(kw in insight.lower() for kw in self.math_keywords[:10]):  # Top 10 math keywords
+                if any(kw in insight_lower for kw in top_keywords):
                     cleaned_reflections.append(reflection)
                 else:
                     removal_log.append({
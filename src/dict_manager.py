@@ -19,25 +19,86 @@ import json
 import os
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Above this size `show` streams the one category it needs instead of loading the whole file
+STREAM_SUMMARY_BYTES = 64 * 1024 * 1024
+
+# Entries listed per section by `show`
+SHOWN_FACTS = 5
+SHOWN_IDEAS = 3
+
+# Read-only parses shared across managers: absolute path -> (file signature, parsed dictionary)
+_PARSED = {}
+
+def _file_signature(path):
+    """Identity of a file's current contents (None if it cannot be stat'ed)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _numbered_lines(entries, width=100):
+    """One printable block of numbered, truncated entries for show_category"""
+    return "\n".join(f"  {i}. {entry[:width]}{'...' if len(entry) > width else ''}"
+                     for i, entry in enumerate(entries, 1))
+
 class DictionaryManager:
     def __init__(self, dict_path="dictionary.json"):
         self.dict_path = dict_path
         
-    def load_dictionary(self):
-        """Load the dictionary file"""
-        if os.path.exists(self.dict_path):
-            with open(self.dict_path, 'r') as f:
-                return json.load(f)
-        return {"categories": {}}
+    def load_dictionary(self, readonly=False):
+        """
+        Load the dictionary file (parsed with orjson when available). With readonly=True
+        the parse is shared between calls while the file is unchanged, so the caller
+        must not modify it; otherwise every call returns a fresh copy.
+        """
+        if not readonly:
+            try:
+                return self._read_json(self.dict_path)
+            except FileNotFoundError:
+                return {"categories": {}}
+        path = os.path.abspath(self.dict_path)
+        signature = _file_signature(path)
+        if signature is None:
+            return {"categories": {}}
+        cached = _PARSED.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        data = self._read_json(path)
+        _PARSED[path] = (signature, data)
+        return data
+    
+    @staticmethod
+    def _read_json(path):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson else json.loads(raw)
     
     def save_dictionary(self, data):
-        """Save the dictionary file"""
-        with open(self.dict_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        """Save the dictionary file (temp file + atomic rename)"""
+        if orjson:
+            serialized = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            serialized = json.dumps(data, indent=2).encode("utf-8")
+        tmp_path = self.dict_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(serialized)
+        os.replace(tmp_path, self.dict_path)
+        _PARSED.pop(os.path.abspath(self.dict_path), None)
     
     def list_categories(self):
         """List all categories in the dictionary"""
-        data = self.load_dictionary()
+        data = self.load_dictionary(readonly=True)
         categories = data.get("categories", {})
         
         print("📚 Dictionary Categories:")
@@ -47,78 +108,136 @@ class DictionaryManager:
             print("No categories found.")
             return
             
-        for category, info in categories.items():
-            facts_count = len(info.get("facts", []))
-            ideas_count = len(info.get("ideas", []))
-            proofs_count = len(info.get("formal_proofs", []))
-            solved = "✅ SOLVED" if info.get("solved", False) else "🔬 Active"
-            
-            print(f"{category:20} | {solved:10} | Facts: {facts_count:3} | Ideas: {ideas_count:3} | Proofs: {proofs_count:3}")
+        print("\n".join(
+            f"{category:20} | {'✅ SOLVED' if info.get('solved', False) else '🔬 Active':10} | "
+            f"Facts: {len(info.get('facts', [])):3} | Ideas: {len(info.get('ideas', [])):3} | "
+            f"Proofs: {len(info.get('formal_proofs', [])):3}"
+            for category, info in categories.items()))
     
     def show_status(self):
         """Show overall status"""
-        data = self.load_dictionary()
+        data = self.load_dictionary(readonly=True)
         categories = data.get("categories", {})
         
-        total_categories = len(categories)
-        solved_count = sum(1 for cat in categories.values() if cat.get("solved", False))
-        active_count = total_categories - solved_count
+        # One pass over the categories accumulates every total
+        solved_count = total_facts = total_ideas = total_proofs = 0
+        for cat in categories.values():
+            solved_count += bool(cat.get("solved", False))
+            total_facts += len(cat.get("facts", []))
+            total_ideas += len(cat.get("ideas", []))
+            total_proofs += len(cat.get("formal_proofs", []))
         
-        total_facts = sum(len(cat.get("facts", [])) for cat in categories.values())
-        total_ideas = sum(len(cat.get("ideas", [])) for cat in categories.values())
-        total_proofs = sum(len(cat.get("formal_proofs", [])) for cat in categories.values())
+        print("\n".join((
+            "📊 Dictionary Status:",
+            "=" * 40,
+            f"Total Categories: {len(categories)}",
+            f"Solved Problems: {solved_count}",
+            f"Active Problems: {len(categories) - solved_count}",
+            f"Total Facts: {total_facts}",
+            f"Total Ideas: {total_ideas}",
+            f"Total Formal Proofs: {total_proofs}",
+        )))
+    
+    def summarize_category(self, category):
+        """
+        Counts, leading facts/ideas and proof outcomes for one category (None if it does not exist).
+        Large files are streamed with ijson when it is installed, so only this summary is kept in memory.
+        """
+        if ijson is not None:
+            try:
+                large = os.stat(self.dict_path).st_size > STREAM_SUMMARY_BYTES
+            except FileNotFoundError:
+                large = False
+            if large:
+                return self._stream_category_summary(category)
         
-        print("📊 Dictionary Status:")
-        print("=" * 40)
-        print(f"Total Categories: {total_categories}")
-        print(f"Solved Problems: {solved_count}")
-        print(f"Active Problems: {active_count}")
-        print(f"Total Facts: {total_facts}")
-        print(f"Total Ideas: {total_ideas}")
-        print(f"Total Formal Proofs: {total_proofs}")
+        cat_data = self.load_dictionary(readonly=True).get("categories", {}).get(category)
+        if cat_data is None:
+            return None
+        facts = cat_data.get("facts", [])
+        ideas = cat_data.get("ideas", [])
+        return {
+            "solved": cat_data.get("solved", False),
+            "solved_timestamp": cat_data.get("solved_timestamp"),
+            "facts_count": len(facts),
+            "facts": facts[:SHOWN_FACTS],
+            "ideas_count": len(ideas),
+            "ideas": ideas[:SHOWN_IDEAS],
+            "formal_proofs": [(proof.get("theorem_name", "Unknown"), proof.get("success", False))
+                              for proof in cat_data.get("formal_proofs", [])]
+        }
+    
+    def _stream_category_summary(self, category):
+        """summarize_category in one ijson pass over the file"""
+        base = f"categories.{category}"
+        facts_prefix, ideas_prefix, proof_prefix = f"{base}.facts.item", f"{base}.ideas.item", f"{base}.formal_proofs.item"
+        summary = {"solved": False, "solved_timestamp": None, "facts_count": 0, "facts": [],
+                   "ideas_count": 0, "ideas": [], "formal_proofs": []}
+        found = False
+        with open(self.dict_path, 'rb') as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix == "categories" and event == "map_key" and value == category:
+                    found = True
+                elif not prefix.startswith(base):
+                    continue
+                elif prefix == facts_prefix and event == "string":
+                    summary["facts_count"] += 1
+                    if len(summary["facts"]) < SHOWN_FACTS:
+                        summary["facts"].append(value)
+                elif prefix == ideas_prefix and event == "string":
+                    summary["ideas_count"] += 1
+                    if len(summary["ideas"]) < SHOWN_IDEAS:
+                        summary["ideas"].append(value)
+                elif prefix == proof_prefix and event == "start_map":
+                    summary["formal_proofs"].append(("Unknown", False))
+                elif prefix == f"{proof_prefix}.theorem_name":
+                    summary["formal_proofs"][-1] = (value, summary["formal_proofs"][-1][1])
+                elif prefix == f"{proof_prefix}.success":
+                    summary["formal_proofs"][-1] = (summary["formal_proofs"][-1][0], value)
+                elif prefix == f"{base}.solved":
+                    summary["solved"] = value
+                elif prefix == f"{base}.solved_timestamp":
+                    summary["solved_timestamp"] = value
+        return summary if found else None
     
     def show_category(self, category):
         """Show detailed information for a specific category"""
-        data = self.load_dictionary()
-        categories = data.get("categories", {})
+        summary = self.summarize_category(category)
         
-        if category not in categories:
+        if summary is None:
             print(f"❌ Category '{category}' not found.")
             return
         
-        cat_data = categories[category]
-        
         print(f"📖 Category: {category}")
         print("=" * 50)
         
-        if cat_data.get("solved", False):
+        if summary["solved"]:
             print("✅ Status: SOLVED")
-            if "solved_timestamp" in cat_data:
-                print(f"🕒 Solved at: {cat_data['solved_timestamp']}")
+            if summary["solved_timestamp"] is not None:
+                print(f"🕒 Solved at: {summary['solved_timestamp']}")
         else:
             print("🔬 Status: Active")
         
-        print(f"\n📝 Facts ({len(cat_data.get('facts', []))}):")
-        for i, fact in enumerate(cat_data.get("facts", [])[:5], 1):
-            print(f"  {i}. {fact[:100]}{'...' if len(fact) > 100 else ''}")
-        if len(cat_data.get("facts", [])) > 5:
-            print(f"  ... and {len(cat_data.get('facts', [])) - 5} more")
+        print(f"\n📝 Facts ({summary['facts_count']}):")
+        if summary["facts"]:
+            print(_numbered_lines(summary["facts"]))
+        if summary["facts_count"] > SHOWN_FACTS:
+            print(f"  ... and {summary['facts_count'] - SHOWN_FACTS} more")
         
-        print(f"\n💡 Ideas ({len(cat_data.get('ideas', []))}):")
-        for i, idea in enumerate(cat_data.get("ideas", [])[:3], 1):
-            print(f"  {i}. {idea[:100]}{'...' if len(idea) > 100 else ''}")
-        if len(cat_data.get("ideas", [])) > 3:
-            print(f"  ... and {len(cat_data.get('ideas', [])) - 3} more")
+        print(f"\n💡 Ideas ({summary['ideas_count']}):")
+        if summary["ideas"]:
+            print(_numbered_lines(summary["ideas"]))
+        if summary["ideas_count"] > SHOWN_IDEAS:
+            print(f"  ... and {summary['ideas_count'] - SHOWN_IDEAS} more")
         
-        print(f"\n🔬 Formal Proofs ({len(cat_data.get('formal_proofs', []))}):")
-        for i, proof in enumerate(cat_data.get("formal_proofs", []), 1):
-            theorem_name = proof.get("theorem_name", "Unknown")
-            success = "✅" if proof.get("success", False) else "❌"
-            print(f"  {i}. {success} {theorem_name}")
+        print(f"\n🔬 Formal Proofs ({len(summary['formal_proofs'])}):")
+        if summary["formal_proofs"]:
+            print("\n".join(f"  {i}. {'✅' if proved else '❌'} {theorem_name}"
+                            for i, (theorem_name, proved) in enumerate(summary["formal_proofs"], 1)))
     
     def list_solved(self):
         """List all solved problems"""
-        data = self.load_dictionary()
+        data = self.load_dictionary(readonly=True)
         categories = data.get("categories", {})
         
         solved_problems = {cat: info for cat, info in categories.items() if info.get("solved", False)}
@@ -130,14 +249,14 @@ class DictionaryManager:
             print("No solved problems yet.")
             return
         
-        for category, info in solved_problems.items():
-            proofs_count = len(info.get("formal_proofs", []))
-            timestamp = info.get("solved_timestamp", "Unknown time")
-            print(f"{category:20} | Proofs: {proofs_count:2} | Solved: {timestamp}")
+        print("\n".join(
+            f"{category:20} | Proofs: {len(info.get('formal_proofs', [])):2} | "
+            f"Solved: {info.get('solved_timestamp', 'Unknown time')}"
+            for category, info in solved_problems.items()))
     
     def list_theorems(self):
         """List all reusable theorems from solved problems"""
-        data = self.load_dictionary()
+        data = self.load_dictionary(readonly=True)
         categories = data.get("categories", {})
         
         print("📚 Reusable Theorems:")
@@ -160,14 +279,13 @@ class DictionaryManager:
     
     def migrate_old_file(self, old_file_path, target_category):
         """Migrate an old memory file to the dictionary"""
-        if not os.path.exists(old_file_path):
+        # Load old memory file
+        try:
+            old_data = self._read_json(old_file_path)
+        except FileNotFoundError:
             print(f"❌ File '{old_file_path}' not found.")
             return
         
-        # Load old memory file
-        with open(old_file_path, 'r') as f:
-            old_data = json.load(f)
-        
         # Load current dictionary
         dict_data = self.load_dictionary()
         
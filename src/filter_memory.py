@@ -49,10 +49,11 @@ def filter_current_memory():
     cleaned_memory, filter_log = content_filter.filter_memory(current_memory)
     
     # Update metadata
+    now = datetime.now().isoformat()
     cleaned_memory["metadata"] = {
         "topic": "P vs NP research",
-        "last_updated": datetime.now().isoformat(),
-        "last_filtered": datetime.now().isoformat(),
+        "last_updated": now,
+        "last_filtered": now,
         "total_facts": len(cleaned_memory.get("facts", [])),
         "total_ideas": len(cleaned_memory.get("ideas", [])),
         "total_reflections": len(cleaned_memory.get("reflections", [])),
@@ -7,6 +7,9 @@ Formal Proof Engine - Integrates with Lean theorem prover for actual mathematica
 import json
 import os
 import subprocess
+import threading
+from collections import deque
+from functools import lru_cache
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import re
@@ -24,16 +27,68 @@ try:
 except ImportError:
     from lean_translator import LeanTranslator
 
+# Only the most recent failure patterns are kept, in memory and on disk
+MAX_FAILURE_PATTERNS = 50
+# Lean verdicts remembered per (theorem, proof) before the cache is reset
+MAX_CACHED_LEAN_CHECKS = 1024
+
+def _lake_project_root(start: str) -> Optional[str]:
+    """
+    Nearest directory at or above start holding a lakefile (None if there is none below /).
+    Not cached: a lakefile may appear or go away during a long run, and a few stat
+    calls are nothing next to the Lean process that follows.
+    """
+    directory = start
+    while directory != "/":
+        if (os.path.exists(os.path.join(directory, "lakefile.toml")) or
+                os.path.exists(os.path.join(directory, "lakefile.lean"))):
+            return directory
+        directory = os.path.dirname(directory)
+    return None
+
+# Pattern matching for common mathematical statements (tried in order)
+_CONJECTURE_PATTERNS = [(re.compile(pattern), lean_statement) for pattern, lean_statement in (
+    (r"P.*=.*NP", "theorem p_eq_np : P = NP"),
+    (r"P.*≠.*NP|P.*!=.*NP", "theorem p_neq_np : P ≠ NP"),
+    (r"SAT.*polynomial", "theorem sat_in_p : SAT ∈ P"),
+    (r"polynomial.*algorithm.*SAT", "theorem sat_poly_alg : ∃ (f : SAT → ℕ), polynomial_time f"),
+    (r"NP.*complete", "theorem np_complete_property (L : Language) : NP_complete L ↔ (L ∈ NP ∧ ∀ L' ∈ NP, L' ≤_p L)"),
+)]
+
+@lru_cache(maxsize=256)
+def _formal_conjecture(informal_statement: str) -> str:
+    """Lean statement (without proof) for an informal one; pure, so repeated statements are cached"""
+    # For even number theorems
+    statement_lower = informal_statement.lower()
+    
+    if "sum" in statement_lower and "even" in statement_lower:
+        clean_name = re.sub(r'[^\w]', '_', informal_statement[:50])
+        # Create a proper mathematical statement about even numbers
+        return f"theorem {clean_name} (a b : ℕ) (ha : Even a) (hb : Even b) : Even (a + b)"
+    
+    for pattern, lean_statement in _CONJECTURE_PATTERNS:
+        if pattern.search(statement_lower):
+            return lean_statement
+            
+    # Generic theorem template without proof
+    clean_name = re.sub(r'[^\w]', '_', informal_statement[:50])
+    return f"theorem {clean_name} : True"
+
 class FormalProofEngine:
     """
     Engine for generating, validating, and learning from formal mathematical proofs
     """
     
-    def __init__(self, api_key: str = None, learning_file: str = "formal_proof_learning.json", llm_name: str = "gemini"):
+    def __init__(self, api_key: str = None, learning_file: str = "formal_proof_learning.json", llm_name: str = "gemini",
+                 verbose: bool = True):
         self.lean_available = LEAN_AVAILABLE
+        self.verbose = verbose  # Per-attempt progress and learning messages (errors always print)
         self.proof_cache = {}
+        self._log_context = threading.local()  # Per-thread prefix of the attempt being logged
         self.learned_tactics = []
+        self._tactic_index = {}  # tactic name -> its entry in learned_tactics
         self.successful_patterns = []
+        self.failure_patterns = deque(maxlen=MAX_FAILURE_PATTERNS)
         self.learning_file = learning_file
         
         # Load previous learning
@@ -66,35 +121,25 @@ class FormalProofEngine:
         """
         Convert informal mathematical statement to formal Lean syntax without proof
         """
-        # For even number theorems
-        statement_lower = informal_statement.lower()
-        
-        if "sum" in statement_lower and "even" in statement_lower:
-            clean_name = re.sub(r'[^\w]', '_', informal_statement[:50])
-            # Create a proper mathematical statement about even numbers
-            return f"theorem {clean_name} (a b : ℕ) (ha : Even a) (hb : Even b) : Even (a + b)"
-        
-        # Pattern matching for common mathematical statements
-        patterns = {
-            r"P.*=.*NP": "theorem p_eq_np : P = NP",
-            r"P.*≠.*NP|P.*!=.*NP": "theorem p_neq_np : P ≠ NP", 
-            r"SAT.*polynomial": "theorem sat_in_p : SAT ∈ P",
-            r"polynomial.*algorithm.*SAT": "theorem sat_poly_alg : ∃ (f : SAT → ℕ), polynomial_time f",
-            r"NP.*complete": "theorem np_complete_property (L : Language) : NP_complete L ↔ (L ∈ NP ∧ ∀ L' ∈ NP, L' ≤_p L)"
-        }
-        
-        for pattern, lean_statement in patterns.items():
-            if re.search(pattern, statement_lower):
-                return lean_statement
-                
-        # Generic theorem template without proof
-        clean_name = re.sub(r'[^\w]', '_', informal_statement[:50])
-        return f"theorem {clean_name} : True"
+        return _formal_conjecture(informal_statement)
+    
+    def _log(self, message: str):
+        """Print a message, labelled with the current thread's attempt prefix (if any)"""
+        print(f"{getattr(self._log_context, 'prefix', '')}{message}")
     
-    def attempt_proof_with_translation(self, informal_statement: str, memory: Optional[dict] = None) -> Dict:
+    def attempt_proof_with_translation(self, informal_statement: str, memory: Optional[dict] = None,
+                                       log_prefix: str = "") -> Dict:
         """
-        Translate informal statement to Lean and attempt proof with iterative refinement
+        Translate informal statement to Lean and attempt proof with iterative refinement.
+        log_prefix labels this attempt's messages when several attempts run concurrently.
         """
+        self._log_context.prefix = log_prefix
+        try:
+            return self._attempt_proof_with_translation(informal_statement, memory)
+        finally:
+            self._log_context.prefix = ""
+    
+    def _attempt_proof_with_translation(self, informal_statement: str, memory: Optional[dict] = None) -> Dict:
         if not self.translator:
             # Fallback to old method
             formal_statement = self.generate_formal_conjecture(informal_statement)
@@ -113,7 +158,8 @@ class FormalProofEngine:
             # Try iterative refinement up to 3 attempts
             max_attempts = 3
             for attempt in range(max_attempts):
-                print(f"[FormalProofEngine] Proof attempt {attempt + 1}/{max_attempts}")
+                if self.verbose:
+                    self._log(f"[FormalProofEngine] Proof attempt {attempt + 1}/{max_attempts}")
 
                 # Use the more sophisticated pipeline method
                 translation_result = self.translator.english_to_lean_pipeline(informal_statement, previous_feedback)
@@ -130,12 +176,14 @@ class FormalProofEngine:
                 # attempt to request a complete proof before running Lean.
                 if proof_attempt:
                     if 'sorry' in proof_attempt.lower():
-                        print(f"[FormalProofEngine] Proof attempt contains 'sorry', requesting a complete proof")
+                        if self.verbose:
+                            self._log(f"[FormalProofEngine] Proof attempt contains 'sorry', requesting a complete proof")
                         better_proof = self._request_complete_proof(lean_theorem, previous_feedback, previous_attempts)
                         if better_proof and 'sorry' not in better_proof.lower():
                             proof_attempt = better_proof
                     elif self.translator.is_trivial_proof(proof_attempt):
-                        print(f"[FormalProofEngine] Got trivial/incomplete proof, requesting better proof attempt")
+                        if self.verbose:
+                            self._log(f"[FormalProofEngine] Got trivial/incomplete proof, requesting better proof attempt")
                         better_proof = self._request_complete_proof(lean_theorem, previous_feedback, previous_attempts)
                         if better_proof and not self.translator.is_trivial_proof(better_proof):
                             proof_attempt = better_proof
@@ -146,14 +194,16 @@ class FormalProofEngine:
                     if any(k in (lean_theorem or '').lower() for k in ['n + 0', 'peano', 'add_zero', 'addition']):
                         sanitized = self._peano_sanitizer(lean_theorem, proof_attempt)
                         if sanitized and sanitized != proof_attempt:
-                            print("[FormalProofEngine] Applied Peano sanitizer (minor syntactic fixes)")
+                            if self.verbose:
+                                self._log("[FormalProofEngine] Applied Peano sanitizer (minor syntactic fixes)")
                             proof_attempt = sanitized
                 except Exception:
                     pass
 
                 # Do a quick syntax sanity check; if it fails try to request a better proof
                 if not self._basic_syntax_check(lean_theorem, proof_attempt):
-                    print(f"[FormalProofEngine] Basic syntax check failed, requesting improved proof/theorem")
+                    if self.verbose:
+                        self._log(f"[FormalProofEngine] Basic syntax check failed, requesting improved proof/theorem")
                     better_proof = self._request_complete_proof(lean_theorem, previous_feedback, previous_attempts)
                     if better_proof and 'sorry' not in better_proof.lower():
                         proof_attempt = better_proof
@@ -178,7 +228,8 @@ class FormalProofEngine:
 
                 # If successful, return immediately
                 if lean_validation["success"]:
-                    print(f"[FormalProofEngine] Success on attempt {attempt + 1}")
+                    if self.verbose:
+                        self._log(f"[FormalProofEngine] Success on attempt {attempt + 1}")
                     return result
                 
                 # If failed, parse feedback and prepare for next iteration
@@ -208,14 +259,16 @@ class FormalProofEngine:
                         memory["lean_feedback"] = list(dict.fromkeys(memory["lean_feedback"]))  # deduplicate
                     
                     result["lean_feedback"] = new_feedback
-                    print(f"[FormalProofEngine] Attempt {attempt + 1} failed, feedback: {new_feedback[:2]}...")  # show first 2 items
+                    if self.verbose:
+                        self._log(f"[FormalProofEngine] Attempt {attempt + 1} failed, feedback: {new_feedback[:2]}...")  # show first 2 items
 
                     # Try a small, targeted escalation for missing identifier errors: ask the LLM
                     # for the minimal import or an alternative lemma and add that to the feedback
                     try:
                         targeted = self._handle_missing_identifier_feedback(new_feedback, lean_theorem)
                         if targeted:
-                            print(f"[FormalProofEngine] Added targeted suggestion for next attempt: {targeted}")
+                            if self.verbose:
+                                self._log(f"[FormalProofEngine] Added targeted suggestion for next attempt: {targeted}")
                             previous_feedback.append(targeted)
                             # persist this hint in memory as well
                             if memory is not None:
@@ -225,17 +278,19 @@ class FormalProofEngine:
                     
                     # If this is the last attempt, return the failed result
                     if attempt == max_attempts - 1:
-                        print(f"[FormalProofEngine] All {max_attempts} attempts failed")
+                        if self.verbose:
+                            self._log(f"[FormalProofEngine] All {max_attempts} attempts failed")
                         return result
             
             return result
                     
         except Exception as e:
-            print(f"Error in proof translation: {e}")
+            self._log(f"Error in proof translation: {e}")
             # Check if this is a quota/API error - if so, propagate it instead of fallback
             err_str = str(e)
-            if ('quota' in err_str.lower() or 'rate limit' in err_str.lower() or 
-                '429' in err_str or 'api error' in err_str.lower()):
+            err_lower = err_str.lower()
+            if ('quota' in err_lower or 'rate limit' in err_lower or 
+                '429' in err_str or 'api error' in err_lower):
                 # Return error result with the LLM error preserved
                 return {
                     "success": False,
@@ -305,18 +360,19 @@ class FormalProofEngine:
         if hasattr(self, 'learned_tactics') and self.learned_tactics:
             # Sort tactics by success rate (success_count / (success_count + failure_count))
             def success_rate(tactic_name):
-                for learned in self.learned_tactics:
-                    if learned["name"] == tactic_name:
-                        successes = learned.get("success_count", 0)
-                        failures = learned.get("failure_count", 0)
-                        total = successes + failures
-                        if total > 0:
-                            return successes / total
+                learned = self._tactic_index.get(tactic_name)
+                if learned:
+                    successes = learned.get("success_count", 0)
+                    failures = learned.get("failure_count", 0)
+                    total = successes + failures
+                    if total > 0:
+                        return successes / total
                 return 0.5  # Default rate for unknown tactics
             
             # Reorder tactics by success rate
             basic_tactics.sort(key=success_rate, reverse=True)
-            print(f"🧠 Using learned tactic ordering: {basic_tactics[:3]}...")
+            if self.verbose:
+                self._log(f"🧠 Using learned tactic ordering: {basic_tactics[:3]}...")
         
         for tactic in basic_tactics:
             try:
@@ -364,22 +420,20 @@ class FormalProofEngine:
             # Update learned tactics frequency for successful tactics
             working_tactics = proof_result.get("proof_steps", [])
             for tactic in working_tactics:
-                found = False
-                for learned_tactic in self.learned_tactics:
-                    if learned_tactic["name"] == tactic:
-                        learned_tactic["success_count"] += 1
-                        learned_tactic["contexts"].append(context[:3])
-                        found = True
-                        break
-                if not found:
-                    self.learned_tactics.append({
+                learned_tactic = self._tactic_index.get(tactic)
+                if learned_tactic:
+                    learned_tactic["success_count"] += 1
+                    learned_tactic["contexts"].append(context[:3])
+                else:
+                    self._add_learned_tactic({
                         "name": tactic,
                         "success_count": 1,
                         "failure_count": 0,
                         "contexts": [context[:3]]
                     })
                     
-            print(f"📚 Learned successful pattern for {theorem_type}: {working_tactics}")
+            if self.verbose:
+                self._log(f"📚 Learned successful pattern for {theorem_type}: {working_tactics}")
             
         else:
             # Learn from failed proofs - track what doesn't work
@@ -396,24 +450,17 @@ class FormalProofEngine:
                 "timestamp": datetime.now().isoformat()
             }
             
-            # Store failure patterns (limit to last 50 to avoid memory bloat)
-            if not hasattr(self, 'failure_patterns'):
-                self.failure_patterns = []
+            # Store failure patterns; the bounded deque drops the oldest one itself
             self.failure_patterns.append(failure_pattern)
-            if len(self.failure_patterns) > 50:
-                self.failure_patterns = self.failure_patterns[-50:]
             
             # Update failure counts for tactics
             for tactic in failed_tactics:
-                found = False
-                for learned_tactic in self.learned_tactics:
-                    if learned_tactic["name"] == tactic:
-                        learned_tactic.setdefault("failure_count", 0)
-                        learned_tactic["failure_count"] += 1
-                        found = True
-                        break
-                if not found:
-                    self.learned_tactics.append({
+                learned_tactic = self._tactic_index.get(tactic)
+                if learned_tactic:
+                    learned_tactic.setdefault("failure_count", 0)
+                    learned_tactic["failure_count"] += 1
+                else:
+                    self._add_learned_tactic({
                         "name": tactic,
                         "success_count": 0,
                         "failure_count": 1,
@@ -421,13 +468,19 @@ class FormalProofEngine:
                     })
                     
             error_type = self._classify_error(lean_error)
-            print(f"📖 Learned failure pattern for {theorem_type}: {error_type}")
-            if lean_error:
-                print(f"[Lean Error Message] {lean_error}")
+            if self.verbose:
+                self._log(f"📖 Learned failure pattern for {theorem_type}: {error_type}")
+                if lean_error:
+                    self._log(f"[Lean Error Message] {lean_error}")
             
         # Save learning data after each learning event
         self._save_learning_data()
             
+    def _add_learned_tactic(self, entry: Dict):
+        """Append a learned tactic and index it by name"""
+        self.learned_tactics.append(entry)
+        self._tactic_index[entry["name"]] = entry
+
     def _load_learning_data(self):
         """Load learning data from file"""
         try:
@@ -437,10 +490,14 @@ class FormalProofEngine:
                 with open(self.learning_file, 'r') as f:
                     data = json.load(f)
                     self.learned_tactics = data.get("learned_tactics", [])
+                    # First entry wins for duplicate names, matching the old linear scan
+                    self._tactic_index = {}
+                    for entry in self.learned_tactics:
+                        self._tactic_index.setdefault(entry["name"], entry)
                     self.successful_patterns = data.get("successful_patterns", [])
-                    if hasattr(self, 'failure_patterns'):
-                        self.failure_patterns = data.get("failure_patterns", [])
-                    print(f"📚 Loaded {len(self.learned_tactics)} learned tactics, {len(self.successful_patterns)} successful patterns")
+                    self.failure_patterns = deque(data.get("failure_patterns", []), maxlen=MAX_FAILURE_PATTERNS)
+                    if self.verbose:
+                        print(f"📚 Loaded {len(self.learned_tactics)} learned tactics, {len(self.successful_patterns)} successful patterns")
         except Exception as e:
             print(f"Warning: Could not load learning data: {e}")
             
@@ -451,12 +508,12 @@ class FormalProofEngine:
             data = {
                 "learned_tactics": self.learned_tactics,
                 "successful_patterns": self.successful_patterns,
-                "failure_patterns": getattr(self, 'failure_patterns', [])
+                "failure_patterns": list(self.failure_patterns)
             }
             with open(self.learning_file, 'w') as f:
                 json.dump(data, f, indent=2)
         except Exception as e:
-            print(f"Warning: Could not save learning data: {e}")
+            self._log(f"Warning: Could not save learning data: {e}")
             
     def _classify_error(self, error_message: str) -> str:
         """Classify the type of Lean error for learning"""
@@ -553,7 +610,8 @@ class FormalProofEngine:
 
         # Look for messages indicating missing imports or modules
         for fb in feedback_list:
-            if 'missing import' in fb.lower() or 'does not exist' in fb.lower() and 'module' in fb.lower():
+            low = fb.lower()
+            if 'missing import' in low or 'does not exist' in low and 'module' in low:
                 # Suggest searching for the module or adding a minimal import hint
                 return "Lean reported a missing import: please add the minimal Mathlib import (e.g., Mathlib.Init.Data.Nat.Basic) or suggest which mathlib module contains the missing identifiers."
 
@@ -731,7 +789,7 @@ class FormalProofEngine:
         suggestions = []
         
         # Analyze what we've proven so far
-        proven_types = [p["theorem_type"] for p in self.successful_patterns]
+        proven_types = {p["theorem_type"] for p in self.successful_patterns}
         
         # Suggest building on successful patterns
         if "complexity_equality" in proven_types:
@@ -759,8 +817,25 @@ class FormalProofEngine:
     
     def test_with_lean(self, theorem_statement: str, proof_attempt: str) -> Dict:
         """
-        Actually test the proof with Lean to validate correctness
+        Actually test the proof with Lean to validate correctness. Lean's verdict is
+        remembered per (theorem, proof), so re-checking an identical attempt skips the
+        subprocess; timeouts and errors are not cached. Treat the result as read-only.
         """
+        # Concurrent attempts share the cache without a lock: get/clear/setitem are each atomic,
+        # and two threads missing the same key at once only run the same Lean check twice
+        key = (theorem_statement, proof_attempt)
+        cached = self.proof_cache.get(key)
+        if cached is not None:
+            return cached
+        result, verdict = self._run_lean(theorem_statement, proof_attempt)
+        if verdict:
+            if len(self.proof_cache) >= MAX_CACHED_LEAN_CHECKS:
+                self.proof_cache.clear()
+            self.proof_cache[key] = result
+        return result
+    
+    def _run_lean(self, theorem_statement: str, proof_attempt: str):
+        """Check the proof in a Lean subprocess; returns (result, whether Lean gave a verdict)"""
         import subprocess
         import tempfile
         import os
@@ -780,29 +855,30 @@ class FormalProofEngine:
                 if "import Mathlib.Init.Data.Nat.Basic" not in merged:
                     merged.insert(0, "import Mathlib.Init.Data.Nat.Basic")
 
-                lean_content = "\n".join(merged) + "\n\n"
-                
                 # Write the theorem - properly combine statement and proof
                 if ':=' in theorem_statement and 'by sorry' in theorem_statement:
                     # Replace "by sorry" with the actual proof attempt
                     if proof_attempt and proof_attempt != "by sorry":
-                        theorem_with_proof = theorem_statement.replace("by sorry", proof_attempt)
-                        lean_content += f"-- Auto-generated proof test\n{theorem_with_proof}\n"
+                        theorem_text = theorem_statement.replace("by sorry", proof_attempt)
                     else:
-                        lean_content += f"-- Auto-generated proof test\n{theorem_statement}\n"
+                        theorem_text = theorem_statement
                 elif ':=' in theorem_statement and 'by' in theorem_statement:
                     # Already a complete theorem
-                    lean_content += f"-- Auto-generated proof test\n{theorem_statement}\n"
+                    theorem_text = theorem_statement
                 else:
                     # Need to construct the full theorem
                     if ':' in theorem_statement and not ':=' in theorem_statement:
                         # Add the proof part
-                        lean_content += f"-- Auto-generated proof test\n{theorem_statement} := {proof_attempt}\n"
+                        theorem_text = f"{theorem_statement} := {proof_attempt}"
                     else:
                         # Assume it's just the theorem name, create a simple structure
-                        lean_content += f"-- Auto-generated proof test\n{theorem_statement}\n"
+                        theorem_text = theorem_statement
                 
-                f.write(lean_content)
+                # Write the pieces straight to the file instead of concatenating them first
+                f.write("\n".join(merged))
+                f.write("\n\n-- Auto-generated proof test\n")
+                f.write(theorem_text)
+                f.write("\n")
                 temp_file = f.name
             
             try:
@@ -814,18 +890,10 @@ class FormalProofEngine:
                     env["PATH"] = f"{lean_path}:{env.get('PATH', '')}"
                 
                 # Use lake env lean to ensure Mathlib is available
-                # First try to find the project root (where lakefile.toml/lakefile.lean exists)
-                project_root = os.getcwd()
-                while project_root != "/" and not (
-                    os.path.exists(os.path.join(project_root, "lakefile.toml")) or 
-                    os.path.exists(os.path.join(project_root, "lakefile.lean"))
-                ):
-                    project_root = os.path.dirname(project_root)
+                # The project root is where lakefile.toml/lakefile.lean exists
+                project_root = _lake_project_root(os.getcwd())
                 
-                if project_root != "/" and (
-                    os.path.exists(os.path.join(project_root, "lakefile.toml")) or 
-                    os.path.exists(os.path.join(project_root, "lakefile.lean"))
-                ):
+                if project_root is not None:
                     # Run lake env lean from the project root
                     result = subprocess.run(
                         ['lake', 'env', 'lean', temp_file], 
@@ -850,30 +918,30 @@ class FormalProofEngine:
                         "success": True,
                         "error": None,
                         "output": result.stdout
-                    }
+                    }, True
                 else:
                     return {
                         "success": False,
                         "error": f"Lean check failed: {result.stderr}",
                         "output": result.stdout
-                    }
+                    }, True
                     
             except subprocess.TimeoutExpired:
                 return {
                     "success": False,
                     "error": "Lean check timed out",
                     "output": None
-                }
+                }, False
             except FileNotFoundError:
                 # Lean not installed, fall back to basic validation
-                return self._basic_proof_validation(theorem_statement, proof_attempt)
+                return self._basic_proof_validation(theorem_statement, proof_attempt), False
                 
         except Exception as e:
             return {
                 "success": False,
                 "error": f"Error testing with Lean: {str(e)}",
                 "output": None
-            }
+            }, False
         finally:
             # Clean up temp file
             try:
@@ -891,11 +959,12 @@ class FormalProofEngine:
         # Create context from previous attempts
         context_info = ""
         if previous_attempts:
-            context_info = "\nPrevious failed attempts:\n"
+            context_parts = ["\nPrevious failed attempts:\n"]
             for i, attempt in enumerate(previous_attempts[-2:]):  # Last 2 attempts
-                context_info += f"Attempt {attempt.get('attempt', i+1)}: {attempt.get('proof_attempt', 'unknown')}\n"
+                context_parts.append(f"Attempt {attempt.get('attempt', i+1)}: {attempt.get('proof_attempt', 'unknown')}\n")
                 if attempt.get('error'):
-                    context_info += f"Error: {attempt['error'][:200]}...\n"
+                    context_parts.append(f"Error: {attempt['error'][:200]}...\n")
+            context_info = "".join(context_parts)
         
         feedback_info = ""
         if previous_feedback:
@@ -988,13 +1057,15 @@ Now produce a complete proof (start the proof with 'by' and do NOT use 'sorry'):
         try:
             complete_proof = self.translator._generate_content(complete_proof_prompt, max_tokens=300)
             if complete_proof and 'sorry' not in complete_proof:
-                print(f"[FormalProofEngine] Got complete proof attempt (no sorry)")
+                if self.verbose:
+                    self._log(f"[FormalProofEngine] Got complete proof attempt (no sorry)")
                 return self.translator._postprocess_lean_proof(complete_proof)
             else:
-                print(f"[FormalProofEngine] Still got sorry or no response")
+                if self.verbose:
+                    self._log(f"[FormalProofEngine] Still got sorry or no response")
                 return None
         except Exception as e:
-            print(f"[FormalProofEngine] Error requesting complete proof: {e}")
+            self._log(f"[FormalProofEngine] Error requesting complete proof: {e}")
             return None
     
     def _basic_proof_validation(self, theorem_statement: str, proof_attempt: str) -> Dict:
@@ -1048,10 +1119,9 @@ Now produce a complete proof (start the proof with 'by' and do NOT use 'sorry'):
         
         # Get failure pattern summary
         failure_summary = {}
-        if hasattr(self, 'failure_patterns'):
-            for pattern in self.failure_patterns:
-                error_type = pattern.get("error_type", "unknown")
-                failure_summary[error_type] = failure_summary.get(error_type, 0) + 1
+        for pattern in self.failure_patterns:
+            error_type = pattern.get("error_type", "unknown")
+            failure_summary[error_type] = failure_summary.get(error_type, 0) + 1
         
         return {
             "total_successful_patterns": len(self.successful_patterns),
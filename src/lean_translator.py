@@ -19,6 +19,24 @@ except ImportError:
     CLAUDE_AVAILABLE = False
     print("Warning: anthropic not available. Install with: pip install anthropic")
 
+# Character budget for the Lean feedback quoted back into proof prompts
+MAX_FEEDBACK_CHARS = 1500
+
+def truncate_for_context(items: list, max_chars: int) -> list:
+    """
+    Most recent items whose combined length (one separator per item) fits in max_chars,
+    always keeping at least the newest one. Walks back from the end once and returns a
+    single slice.
+    """
+    total = 0
+    start = len(items)
+    while start > 0:
+        total += len(items[start - 1]) + 1
+        if total > max_chars and start < len(items):
+            break
+        start -= 1
+    return items[start:]
+
 class LeanTranslator:
     def is_trivial_proof(self, proof_attempt: str) -> bool:
         """
@@ -165,7 +183,7 @@ Your proof:"""
         
         # If there is previous Lean feedback, add it to the prompt
         if previous_feedback:
-            feedback_str = '\n'.join(previous_feedback)
+            feedback_str = '\n'.join(truncate_for_context(previous_feedback, MAX_FEEDBACK_CHARS))
             proof_prompt += f"\n\nPrevious Lean errors to fix:\n{feedback_str}"
             
         proof_attempt = None
@@ -1,9 +1,12 @@
 """
 LLM Manager - Unified interface for multiple language models with rate limiting
 """
+import asyncio
+import threading
 import time
 from collections import deque
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 import sys
 import os
 
@@ -19,6 +22,11 @@ DEFAULT_CONFIG = {
         "gpt2-large": "gpt2-large"
     },
     "FALLBACK_LOCAL_MODEL": "gpt2",
+    "DRAFT_MODEL": None,
+    "SPECULATIVE_MAX_TOKENS": 128,
+    "LLM_SERVER_URL": "http://localhost:8000/v1/completions",
+    "LLM_SERVER_MODEL": None,
+    "LLM_SERVER_TIMEOUT": 120,
     "MAX_TOKENS": 100,
     "TEMPERATURE": 0.7,
     "VERBOSE_OUTPUT": True,
@@ -26,6 +34,14 @@ DEFAULT_CONFIG = {
     "LOG_API_CALLS": False
 }
 
+# Texts the backends return in place of a completion; never treat them as model output
+GENERATION_ERROR = "Error generating response"
+LOCAL_MODEL_UNAVAILABLE = "Local model not available"
+CLAUDE_NOT_INITIALIZED = "Claude client not initialized"
+SERVER_NOT_INITIALIZED = "Completion server not initialized"
+ERROR_RESPONSES = frozenset({GENERATION_ERROR, LOCAL_MODEL_UNAVAILABLE, CLAUDE_NOT_INITIALIZED,
+                             SERVER_NOT_INITIALIZED})
+
 
 # Conditional imports based on availability
 try:
@@ -43,18 +59,28 @@ except ImportError:
     print("Warning: anthropic not available. Install with: pip install anthropic")
 
 try:
-    from transformers import pipeline
+    from transformers import pipeline, AutoModelForCausalLM
     TRANSFORMERS_AVAILABLE = True
 except ImportError:
     TRANSFORMERS_AVAILABLE = False
     print("Warning: transformers not available. Install with: pip install transformers")
 
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+    print("Warning: requests not available. Install with: pip install requests")
+
 class RateLimiter:
     """Simple rate limiter using a sliding window"""
-    def __init__(self, max_requests: int, time_window: int = 60):
+    def __init__(self, max_requests: int, time_window: int = 60, verbose: bool = True):
         self.max_requests = max_requests
         self.time_window = time_window
+        self.verbose = verbose
         self.requests = deque()
+        # generate_batch calls the API from several threads; check and record must not interleave
+        self._lock = threading.Lock()
     
     def can_make_request(self) -> bool:
         """Check if we can make a request without exceeding rate limit"""
@@ -76,9 +102,15 @@ class RateLimiter:
             oldest_request = self.requests[0]
             wait_time = (oldest_request + self.time_window) - time.time()
             if wait_time > 0:
-                if self.config.get("VERBOSE_OUTPUT", True):
+                if self.verbose:
                     print(f"Rate limit reached. Waiting {wait_time:.1f} seconds...")
                 time.sleep(wait_time + 0.1)  # Add small buffer
+    
+    def acquire(self):
+        """Wait for a free slot and record the request in one step (thread-safe)"""
+        with self._lock:
+            self.wait_if_needed()
+            self.record_request()
 
 class LLMManager:
     """Unified manager for multiple LLM backends"""
@@ -89,11 +121,13 @@ class LLMManager:
         self.preferred_model = preferred_model or "gpt2-medium"
         self.current_model = None
         self.local_pipeline = None
+        self.draft_model = None
+        self._local_lock = threading.Lock()  # transformers pipelines are not thread-safe
         
         # Rate limiters for different APIs
         self.rate_limiters = {
-            "gemini": RateLimiter(self.config.get("GEMINI_RATE_LIMIT", 15)),
-            "openai": RateLimiter(self.config.get("OPENAI_RATE_LIMIT", 60))
+            "gemini": RateLimiter(self.config.get("GEMINI_RATE_LIMIT", 15), verbose=self.config.get("VERBOSE_OUTPUT", True)),
+            "openai": RateLimiter(self.config.get("OPENAI_RATE_LIMIT", 60), verbose=self.config.get("VERBOSE_OUTPUT", True))
         }
         
         # Initialize the preferred model
@@ -105,6 +139,8 @@ class LLMManager:
             self.current_model = "gemini"
         elif self.preferred_model == "claude-sonnet" and self._init_claude():
             self.current_model = "claude-sonnet"
+        elif self.preferred_model == "local-server" and self._init_server():
+            self.current_model = "local-server"
         elif self.preferred_model in self.config.get("LOCAL_MODELS", {}) and self._init_local_model(self.preferred_model):
             self.current_model = self.preferred_model
         else:
@@ -135,6 +171,19 @@ class LLMManager:
             print(f"Failed to initialize Claude Sonnet: {e}")
             return False
     
+    def _init_server(self) -> bool:
+        """Initialize an OpenAI-compatible completion server (vLLM, text-generation-inference, llama.cpp)"""
+        endpoint = self.config.get("LLM_SERVER_URL") or DEFAULT_CONFIG["LLM_SERVER_URL"]
+        if not REQUESTS_AVAILABLE:
+            print("[Server Init] requests package not available.")
+            return False
+        # The server keeps the weights loaded between runs; one session keeps the connection open
+        self.server_session = requests.Session()
+        self.server_endpoint = endpoint
+        if self.config.get("VERBOSE_OUTPUT", True):
+            print(f"✓ Completion server configured: {endpoint}")
+        return True
+    
     def _init_gemini(self) -> bool:
         """Initialize Gemini API"""
         api_key = self.config.get("GEMINI_API_KEY")
@@ -170,11 +219,34 @@ class LLMManager:
             )
             if self.config.get("VERBOSE_OUTPUT", True):
                 print(f"✓ Local model initialized: {model_id}")
+            self.draft_model = self._load_draft_model()
             return True
         except Exception as e:
             print(f"Failed to initialize local model {model_name}: {e}")
             return False
     
+    def _load_draft_model(self):
+        """Load the optional small draft model (same tokenizer as the main model) for speculative decoding"""
+        draft_id = self.config.get("DRAFT_MODEL")
+        if not draft_id:
+            return None
+        try:
+            draft_model = AutoModelForCausalLM.from_pretrained(draft_id)
+            if self.config.get("VERBOSE_OUTPUT", True):
+                print(f"✓ Draft model initialized: {draft_id}")
+            return draft_model
+        except Exception as e:
+            print(f"Failed to initialize draft model {draft_id}: {e}")
+            return None
+    
+    def _local_generation_kwargs(self, max_tokens: int) -> Dict[str, Any]:
+        """Pipeline arguments; short generations are drafted by the draft model and verified by the main one"""
+        # return_full_text=False: the pipeline returns only the completion, not the echoed prompt
+        kwargs = {"max_new_tokens": max_tokens, "return_full_text": False}
+        if self.draft_model is not None and max_tokens < self.config.get("SPECULATIVE_MAX_TOKENS", 128):
+            kwargs["assistant_model"] = self.draft_model
+        return kwargs
+    
     def generate(self, prompt: str, max_tokens: int = None) -> str:
         """Generate text using the current model"""
         max_tokens = max_tokens or self.config.get("MAX_TOKENS", 100)
@@ -182,13 +254,53 @@ class LLMManager:
             return self._generate_gemini(prompt, max_tokens)
         elif self.current_model == "claude-sonnet":
             return self._generate_claude(prompt, max_tokens)
+        elif self.current_model == "local-server":
+            return self._generate_server_batch([prompt], max_tokens)[0]
         else:
             return self._generate_local(prompt, max_tokens)
 
+    async def generate_async(self, prompt: str, max_tokens: int = None) -> str:
+        """
+        Awaitable generate, e.g. for asyncio.gather over many prompts. The blocking
+        backend call runs in the default executor; local pipeline calls take turns.
+        """
+        loop = asyncio.get_running_loop()
+        if self.current_model in ["gemini", "claude-sonnet", "local-server"]:
+            return await loop.run_in_executor(None, self.generate, prompt, max_tokens)
+        return await loop.run_in_executor(None, self._generate_locked, prompt, max_tokens)
+    
+    def _generate_locked(self, prompt: str, max_tokens: int = None) -> str:
+        with self._local_lock:
+            return self.generate(prompt, max_tokens)
+
+    def generate_batch(self, prompts: List[str], max_tokens=None) -> List[str]:
+        """
+        Generate text for several independent prompts, returned in order.
+        max_tokens is either one limit for all prompts or a per-prompt list.
+        """
+        if isinstance(max_tokens, list):
+            limits = [tokens or self.config.get("MAX_TOKENS", 100) for tokens in max_tokens]
+        else:
+            limits = [max_tokens or self.config.get("MAX_TOKENS", 100)] * len(prompts)
+        if len(prompts) <= 1:
+            return [self.generate(prompt, tokens) for prompt, tokens in zip(prompts, limits)]
+        if self.current_model in ["gemini", "claude-sonnet"]:
+            # API calls are independent round-trips, so overlap them
+            with ThreadPoolExecutor(max_workers=len(prompts)) as pool:
+                return list(pool.map(self.generate, prompts, limits))
+        # One pipeline call (or server request) per distinct token limit
+        batch = self._generate_server_batch if self.current_model == "local-server" else self._generate_local_batch
+        texts = [None] * len(prompts)
+        for tokens in dict.fromkeys(limits):
+            group = [i for i, limit in enumerate(limits) if limit == tokens]
+            for i, text in zip(group, batch([prompts[i] for i in group], tokens)):
+                texts[i] = text
+        return texts
+
     def _generate_claude(self, prompt: str, max_tokens: int) -> str:
         """Generate using Claude Sonnet API"""
         if not hasattr(self, "claude_client"):
-            return "Claude client not initialized"
+            return CLAUDE_NOT_INITIALIZED
         try:
             if self.config.get("LOG_API_CALLS", False):
                 print(f"API Call: Claude Sonnet - {prompt[:50]}...")
@@ -208,60 +320,101 @@ class LLMManager:
             return str(response)
         except Exception as e:
             print(f"Claude Sonnet API error: {e}")
-            return "Error generating response"
+            return GENERATION_ERROR
     
     def _generate_gemini(self, prompt: str, max_tokens: int) -> str:
         """Generate using Gemini API with rate limiting"""
         if self.config.get("ENABLE_RATE_LIMITING", True):
-            self.rate_limiters["gemini"].wait_if_needed()
+            # The slot is taken before the call so concurrent batch prompts cannot overshoot the limit
+            self.rate_limiters["gemini"].acquire()
         
         try:
             if self.config.get("LOG_API_CALLS", False):
                 print(f"API Call: Gemini - {prompt[:50]}...")
             
             response = self.gemini_model.generate_content(prompt)
-            
-            if self.config.get("ENABLE_RATE_LIMITING", True):
-                self.rate_limiters["gemini"].record_request()
-            
             return response.text
             
         except Exception as e:
             print(f"Gemini API error: {e}")
             # Fallback to local model
             fallback_model = self.config.get("FALLBACK_LOCAL_MODEL", "gpt2")
-            if self._init_local_model(fallback_model):
-                self.current_model = fallback_model
-                print(f"Falling back to local model: {fallback_model}")
+            # Batch prompts can fail together; the first thread switches to the local model, the rest reuse it
+            with self._local_lock:
+                if self.current_model != fallback_model:
+                    if not self._init_local_model(fallback_model):
+                        return GENERATION_ERROR
+                    self.current_model = fallback_model
+                    print(f"Falling back to local model: {fallback_model}")
                 return self._generate_local(prompt, max_tokens)
-            else:
-                return "Error generating response"
     
     def _generate_local(self, prompt: str, max_tokens: int) -> str:
         """Generate using local transformers model"""
         if not self.local_pipeline:
-            return "Local model not available"
+            return LOCAL_MODEL_UNAVAILABLE
         
         try:
             if self.config.get("LOG_API_CALLS", False):
                 print(f"Local Call: {self.current_model} - {prompt[:50]}...")
             
-            result = self.local_pipeline(prompt, max_new_tokens=max_tokens)
-            text = result[0]["generated_text"]
+            result = self.local_pipeline(prompt, **self._local_generation_kwargs(max_tokens))
+            return result[0]["generated_text"].strip()
             
-            # Remove the prompt from the result
-            if text.startswith(prompt):
-                text = text[len(prompt):].strip()
+        except Exception as e:
+            print(f"Local model error: {e}")
+            return GENERATION_ERROR
+    
+    def _generate_local_batch(self, prompts: List[str], max_tokens: int) -> List[str]:
+        """Generate for several prompts with a single local pipeline call"""
+        if not self.local_pipeline:
+            return [LOCAL_MODEL_UNAVAILABLE] * len(prompts)
+        
+        try:
+            if self.config.get("LOG_API_CALLS", False):
+                print(f"Local Batch Call: {self.current_model} - {len(prompts)} prompts")
             
-            return text
+            results = self.local_pipeline(prompts, **self._local_generation_kwargs(max_tokens))
+            return [result[0]["generated_text"].strip() for result in results]
             
         except Exception as e:
             print(f"Local model error: {e}")
-            return "Error generating response"
+            return [GENERATION_ERROR] * len(prompts)
+    
+    def _generate_server_batch(self, prompts: List[str], max_tokens: int) -> List[str]:
+        """Generate for several prompts with a single request to the completion server"""
+        if not hasattr(self, "server_session"):
+            return [SERVER_NOT_INITIALIZED] * len(prompts)
+        
+        try:
+            if self.config.get("LOG_API_CALLS", False):
+                print(f"Server Call: {self.server_endpoint} - {len(prompts)} prompts")
+            
+            payload = {
+                "prompt": prompts,
+                "max_tokens": max_tokens,
+                "temperature": self.config.get("TEMPERATURE", 0.7),
+                "stream": False
+            }
+            if self.config.get("LLM_SERVER_MODEL"):
+                payload["model"] = self.config["LLM_SERVER_MODEL"]
+            response = self.server_session.post(self.server_endpoint, json=payload,
+                                                timeout=self.config.get("LLM_SERVER_TIMEOUT", 120))
+            response.raise_for_status()
+            choices = sorted(response.json()["choices"], key=lambda choice: choice.get("index", 0))
+            return [choice["text"].strip() for choice in choices]
+            
+        except Exception as e:
+            print(f"Completion server error: {e}")
+            return [GENERATION_ERROR] * len(prompts)
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the current model"""
-        model_type = "api" if self.current_model in ["gemini", "claude-sonnet"] else "local"
+        if self.current_model in ["gemini", "claude-sonnet"]:
+            model_type = "api"
+        elif self.current_model == "local-server":
+            model_type = "server"
+        else:
+            model_type = "local"
         rate_limited = self.config.get("ENABLE_RATE_LIMITING", True) and self.current_model in ["gemini", "claude-sonnet"]
         return {
             "current_model": self.current_model,
@@ -1,4 +1,5 @@
 import os
+import copy
 import json
 from typing import Optional, Dict, List, Any
 
@@ -11,11 +12,33 @@ try:
     import memcache
 except ImportError:
     memcache = None
+# Optional fast JSON codec for the file, memcached and in-process backends
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class MemoryBackend:
     FILE = "file"
     MONGODB = "mongodb"
     MEMCACHED = "memcached"
+    MEMORY = "memory"  # In-process store (tests, throwaway runs)
+
+def _loads(raw):
+    """Parse JSON text/bytes, using orjson when available"""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _dumps(data, indent: bool = True) -> bytes:
+    """Serialize to JSON bytes (indented for files, compact for caches), using orjson when available"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2) if indent else orjson.dumps(data)
+    if indent:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def _persistable(memory):
+    """Drop underscore-prefixed keys, which hold in-process indexes (e.g. novelty indexes)"""
+    return {k: v for k, v in memory.items() if not k.startswith("_")}
 
 class Memory:
     def __init__(self, config: Optional[dict] = None, category: str = None):
@@ -39,6 +62,8 @@ class Memory:
         self.mongo_db = config.get("mongo_db", "pocketresearcher") if config else "pocketresearcher"
         self.mongo_collection = config.get("mongo_collection", "memory") if config else "memory"
         self.memcached_host = config.get("memcached_host", "127.0.0.1:11211") if config else "127.0.0.1:11211"
+        # (file signature, parsed dictionary) from the last read or write of the file backend
+        self._parsed = None
         self._setup_backend()
 
     def _get_dictionary_path(self):
@@ -59,25 +84,50 @@ class Memory:
         memory_path = os.path.join(project_root, "memory.json")
         return memory_path
 
+    def _file_signature(self):
+        """Identity of the dictionary file's current contents (None if it cannot be stat'ed)"""
+        try:
+            st = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _read_dictionary(self, reuse: bool = True):
+        """
+        Parse the dictionary file. A unified dictionary is remembered together with the
+        file signature, so later reads skip re-parsing while the file is unchanged.
+        """
+        signature = self._file_signature()
+        if reuse and signature is not None and self._parsed and self._parsed[0] == signature:
+            return self._parsed[1]
+        with open(self.file_path, "rb") as f:
+            data = _loads(f.read())
+        if reuse and signature is not None and "categories" in data:
+            self._parsed = (signature, data)
+        return data
+
     def _setup_backend(self):
         if self.backend == MemoryBackend.MONGODB and pymongo:
             self.mongo_client = pymongo.MongoClient(self.mongo_uri)
             self.collection = self.mongo_client[self.mongo_db][self.mongo_collection]
         elif self.backend == MemoryBackend.MEMCACHED and memcache:
             self.mc = memcache.Client([self.memcached_host], debug=0)
+        elif self.backend == MemoryBackend.MEMORY:
+            self._store = {}  # key -> serialized JSON, so loads never alias saved objects
 
     def load(self, category: str = None):
         """Load memory data, optionally for a specific category"""
         if self.backend == MemoryBackend.FILE:
             if os.path.exists(self.file_path):
-                with open(self.file_path, "r") as f:
-                    data = json.load(f)
+                # The whole dictionary goes back to the caller, so only category loads share the parse
+                data = self._read_dictionary(reuse=bool(category))
                     
                 # Handle unified dictionary format
                 if "categories" in data:
                     if category:
                         if category in data["categories"]:
-                            return data["categories"][category]
+                            # The parse is kept for later saves, so callers get their own copy
+                            return copy.deepcopy(data["categories"][category])
                         else:
                             # Create empty category structure
                             empty_category = {"facts": [], "ideas": [], "reflections": [], "proofs": [], "techniques": [], "experiments": [], "formal_proofs": []}
@@ -109,7 +159,13 @@ class Memory:
             cache_key = f"memory_{category}" if category else "memory"
             data = self.mc.get(cache_key)
             if data:
-                return json.loads(data)
+                return _loads(data)
+            return {"facts": [], "ideas": [], "reflections": [], "proofs": [], "techniques": [], "experiments": [], "formal_proofs": []}
+            
+        elif self.backend == MemoryBackend.MEMORY:
+            data = self._store.get(f"memory_{category}" if category else "memory")
+            if data:
+                return _loads(data)
             return {"facts": [], "ideas": [], "reflections": [], "proofs": [], "techniques": [], "experiments": [], "formal_proofs": []}
         else:
             raise RuntimeError("Unsupported backend or missing library")
@@ -117,17 +173,6 @@ class Memory:
     def save(self, memory, category: str = None):
         """Save memory data, optionally for a specific category"""
         if self.backend == MemoryBackend.FILE:
-            # Load existing dictionary structure
-            if os.path.exists(self.file_path):
-                with open(self.file_path, "r") as f:
-                    full_data = json.load(f)
-            else:
-                full_data = {"categories": {}}
-                
-            # Ensure categories structure exists
-            if "categories" not in full_data:
-                full_data["categories"] = {}
-
             # Fallback to self.category if category not provided
             if category is None:
                 category = self.category
@@ -139,20 +184,37 @@ class Memory:
                 # Legacy save - need to specify category
                 if not category:
                     raise ValueError("Category must be specified when saving legacy format data")
-                # Save to specific category
-                full_data["categories"][category] = memory
+                # Load existing dictionary structure
+                if os.path.exists(self.file_path):
+                    full_data = self._read_dictionary()
+                else:
+                    full_data = {"categories": {}}
+                # Ensure categories structure exists
+                if "categories" not in full_data:
+                    full_data["categories"] = {}
+                # Save to specific category; a copy, since full_data is kept as the parse of the new file
+                full_data["categories"][category] = copy.deepcopy(_persistable(memory))
                     
-            # Write back to file
-            with open(self.file_path, "w") as f:
-                json.dump(full_data, f, indent=2)
+            # Write to a temp file and atomically swap it in so a crash never
+            # leaves a partially written dictionary behind
+            tmp_path = self.file_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_dumps(full_data))
+            os.replace(tmp_path, self.file_path)
+            # What was just written is the parse of the new file (unless it is the caller's own object)
+            signature = self._file_signature()
+            self._parsed = (signature, full_data) if signature is not None and full_data is not memory else None
                 
         elif self.backend == MemoryBackend.MONGODB and pymongo:
             doc_id = f"memory_{category}" if category else "memory"
-            self.collection.update_one({"_id": doc_id}, {"$set": {"data": memory}}, upsert=True)
+            self.collection.update_one({"_id": doc_id}, {"$set": {"data": _persistable(memory)}}, upsert=True)
             
         elif self.backend == MemoryBackend.MEMCACHED and memcache:
             cache_key = f"memory_{category}" if category else "memory"
-            self.mc.set(cache_key, json.dumps(memory))
+            self.mc.set(cache_key, _dumps(_persistable(memory), indent=False))
+            
+        elif self.backend == MemoryBackend.MEMORY:
+            self._store[f"memory_{category}" if category else "memory"] = _dumps(_persistable(memory), indent=False)
         else:
             raise RuntimeError("Unsupported backend or missing library")
 
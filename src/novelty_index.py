@@ -0,0 +1,188 @@
+#!/usr/bin/python3
+
+"""
+Novelty Index - shingle-overlap near-duplicate detection for facts and ideas
+"""
+
+import re
+from itertools import chain
+from typing import List, Set
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[^\sa-z0-9]+")
+
+# Shingle sets are stored as 512-bit bitsets (8 x uint64 words per entry)
+BITSET_WORDS = 8
+_BITSET_MASK = BITSET_WORDS * 64 - 1
+
+# Below this many entries the NumPy sweep is faster than importing Numba and loading its kernel
+KERNEL_MIN_ENTRIES = 50000
+_kernel = None
+
+
+def _overlap_kernel():
+    """The Numba overlap kernel (None without Numba), imported on first use"""
+    global _kernel
+    if _kernel is None:
+        try:
+            from src.novelty_kernel import NUMBA_AVAILABLE, max_overlap
+        except ImportError:
+            from novelty_kernel import NUMBA_AVAILABLE, max_overlap
+        _kernel = max_overlap if NUMBA_AVAILABLE else False
+    return _kernel or None
+
+
+if np is not None and not hasattr(np, "bitwise_count"):
+    # NumPy < 2.0 has no popcount ufunc; count bits byte-wise through a LUT
+    _POPCOUNT_LUT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def word_shingles(text: str) -> Set[str]:
+    """Word 2-shingles of the lowercased text (single token if the text is one word)"""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < 2:
+        return set(tokens)
+    return {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def shingle_hashes(text: str) -> frozenset:
+    """
+    Hashes of the word 2-shingles of the text, taken on token pairs so no shingle
+    strings are built. Python salts str hashes per process, so they are never persisted.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < 2:
+        return frozenset(map(hash, tokens))
+    return frozenset(map(hash, zip(tokens, tokens[1:])))
+
+
+def shingle_bitset(hashes: List[int]) -> int:
+    """Fold shingle hashes into a BITSET_WORDS * 64 bit bitset (as a Python int)"""
+    bits = 0
+    for h in hashes:
+        bits |= 1 << (h & _BITSET_MASK)
+    return bits
+
+
+def _bitset_rows(hash_sets: List[frozenset]):
+    """Bitsets (n, BITSET_WORDS) uint64 and set-bit counts of several shingle hash sets at once"""
+    lengths = np.fromiter(map(len, hash_sets), dtype=np.intp, count=len(hash_sets))
+    positions = np.fromiter(chain.from_iterable(hash_sets), dtype=np.int64, count=int(lengths.sum()))
+    bits = np.zeros((len(hash_sets), BITSET_WORDS * 64), dtype=bool)
+    bits[np.repeat(np.arange(len(hash_sets)), lengths), positions & _BITSET_MASK] = True
+    rows = np.packbits(bits, axis=1, bitorder="little").view("<u8").astype(np.uint64, copy=False)
+    return rows, bits.sum(axis=1, dtype=np.int64)
+
+
+def _row_popcounts(rows):
+    """Set bits per row of a (n, BITSET_WORDS) uint64 array"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(rows).sum(axis=1, dtype=np.int64)
+    return _POPCOUNT_LUT[rows.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+class NoveltyIndex:
+    """
+    Near-duplicate index over short texts.
+
+    A text is not novel if more than `threshold` of the smaller shingle set is
+    shared with some entry, which covers near duplicates as well as a text
+    contained in an entry or containing one. Each query sweeps the shingle
+    bitsets of all entries in one vectorized AND/popcount pass with NumPy (or
+    the parallel Numba kernel in novelty_kernel.py for very large indexes),
+    and the rows it flags are confirmed on the entries' exact shingle hashes.
+
+    add() only hashes the text; bitsets are built in bulk by the next query,
+    so indexing a whole memory for a single check stays cheap.
+    """
+
+    def __init__(self, threshold: float = 0.6):
+        self.threshold = threshold
+        # Exact shingle hashes per entry, to confirm the rows flagged by the sweep
+        self._hash_sets: List[frozenset] = []
+        # Shingle hash sets seen so far, so exact repeats are rejected without a sweep
+        self._seen = set()
+        # Bitset rows of the first _count entries (the rest are built by the next sweep)
+        self._count = 0
+        if np is not None:
+            self._bitsets = np.zeros((0, BITSET_WORDS), dtype=np.uint64)
+            self._sizes = np.zeros(0, dtype=np.int64)
+        else:
+            self._bitsets: List[int] = []
+            self._sizes: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._hash_sets)
+
+    def add(self, text: str):
+        """Insert a text into the index"""
+        entry = shingle_hashes(text)
+        if not entry:
+            return
+        self._seen.add(entry)
+        self._hash_sets.append(entry)
+
+    @staticmethod
+    def _to_words(bits: int):
+        return np.array([(bits >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(BITSET_WORDS)],
+                        dtype=np.uint64)
+
+    def _build_rows(self):
+        """Append the bitset rows of the entries added since the last sweep"""
+        pending = self._hash_sets[self._count:]
+        if not pending:
+            return
+        if np is not None:
+            rows, sizes = _bitset_rows(pending)
+            self._bitsets = np.concatenate([self._bitsets, rows])
+            self._sizes = np.concatenate([self._sizes, sizes])
+        else:
+            for hashes in pending:
+                bits = shingle_bitset(hashes)
+                self._bitsets.append(bits)
+                self._sizes.append(bin(bits).count("1"))
+        self._count = len(self._hash_sets)
+
+    def _overlapping_rows(self, bits: int) -> List[int]:
+        """Ids of all entries whose bitset overlaps the given one by more than `threshold`"""
+        self._build_rows()
+        size = bin(bits).count("1")
+        if np is not None:
+            words = self._to_words(bits)
+            kernel = _overlap_kernel() if self._count >= KERNEL_MIN_ENTRIES else None
+            # The common case is a novel text: the kernel rules it out without temporaries
+            if kernel is not None and kernel(words, size, self._bitsets, self._sizes,
+                                             np.arange(self._count, dtype=np.intp)) <= self.threshold:
+                return []
+            inter = _row_popcounts(self._bitsets & words)
+            return np.flatnonzero(inter / np.minimum(self._sizes, size) > self.threshold).tolist()
+        return [i for i, (row, row_size) in enumerate(zip(self._bitsets, self._sizes))
+                if bin(bits & row).count("1") / min(size, row_size) > self.threshold]
+
+    def is_novel(self, text: str) -> bool:
+        """
+        True unless some entry overlaps the text by more than `threshold`
+        (overlap = shared shingles / shingles of the smaller text, so a text
+        contained in an existing entry, or containing one, is not novel).
+
+        Texts of very different length are exactly the pairs containment is
+        about, so entries are not pruned by length or by a similarity sketch.
+        The bitset sweep is only a prefilter: a long entry sets enough of the
+        bits to overlap a short text by chance, so every flagged row is
+        confirmed on the exact shingle hashes before the text is rejected.
+        Exact repeats (the common case with LLM output) are caught up front.
+        """
+        query = shingle_hashes(text)
+        if not query:
+            return True
+        if query in self._seen:
+            return False
+        for i in self._overlapping_rows(shingle_bitset(query)):
+            entry = self._hash_sets[i]
+            if len(query & entry) > self.threshold * min(len(query), len(entry)):
+                return False
+        return True
@@ -15,9 +15,15 @@ Examples:
 
 import sys
 import os
+import re
+import atexit
+import hashlib
 import datetime
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from typing import Callable
 
 # Add project root to path (since we're now in src/)
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -25,6 +31,54 @@ sys.path.insert(0, project_root)
 
 from config_unified import create_config, list_available_llms, list_available_problems, INITIAL_AXIOMS
 
+try:
+    from src.novelty_index import NoveltyIndex
+except ImportError:
+    from novelty_index import NoveltyIndex
+
+# Cross-contamination indicators: case-insensitive substrings, compiled once per process
+def _indicator_re(indicators):
+    return re.compile("|".join(map(re.escape, indicators)), re.I)
+
+_PNP_FACT_RE = _indicator_re(['np-complete', 'polynomial time', 'sat', 'complexity theory', 'p vs np', 'p = np'])
+_PNP_THEOREM_RE = _indicator_re(['polynomial time', 'np-complete', 'complexity theory', 'p vs np', 'p = np',
+                                 'reduction', 'sat problem'])
+_NUMBER_THEORY_RE = _indicator_re(['even number', 'odd number', '2k where k', 'divisible by 2'])
+
+# Wrong-domain indicators for stored facts per category: number theory problems must not
+# drift into P vs NP content and vice versa
+_CONTAMINATION_RE = {
+    "even_numbers": _PNP_FACT_RE,
+    "p_vs_np": _NUMBER_THEORY_RE,
+}
+
+# Line prefixes that extract_meaningful_content skips
+_SKIP_PREFIX_RE = re.compile(
+    r"^(?:solution|problem|answer|step|example|note|possible rewrite|rewrite|question|hint)\b", re.I
+)
+
+# Words that mark a line as mathematical content
+_MATH_KEYWORDS = frozenset([
+    "even", "odd", "number", "integer", "sum", "addition", "proof",
+    "algebra", "divisible", "remainder", "theorem", "property"
+])
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Reused between validate_memory_consistency calls so its backing array is kept
+_WRONG_DOMAIN_BUFFER = []
+
+# Memory sections that start out empty (facts and ideas are seeded from the config)
+_EMPTY_MEMORY_SECTIONS = ("reflections", "proofs", "techniques", "experiments", "formal_proofs")
+
+# On-disk LLM response cache: problem name -> {key: text}, loaded once per process
+LLM_CACHE_DIR = ".llm_cache"
+_LLM_CACHE = {}
+
+# Append-only files (research logs, LLM cache) kept open for the life of the process:
+# path -> [handle, unflushed entries]
+LOG_FLUSH_EVERY = 1
+_LOG_HANDLES = {}
+
 def main():
     """Main entry point with unified configuration"""
     
@@ -113,6 +167,9 @@ def run_research_loop(config):
                 "gpt2-large": "gpt2-large"
             },
             "FALLBACK_LOCAL_MODEL": config.FALLBACK_LOCAL_MODEL,
+            "DRAFT_MODEL": getattr(config, 'DRAFT_MODEL', None),
+            "LLM_SERVER_URL": getattr(config, 'LLM_SERVER_URL', None),
+            "LLM_SERVER_MODEL": getattr(config, 'LLM_SERVER_MODEL', None),
             "MAX_TOKENS": config.MAX_TOKENS,
             "TEMPERATURE": config.TEMPERATURE,
             "VERBOSE_OUTPUT": config.VERBOSE_OUTPUT,
@@ -127,7 +184,8 @@ def run_research_loop(config):
         api_key = getattr(config, 'CLAUDE_API_KEY', None) if config.ENABLE_LEAN_TRANSLATION else None
     else:
         api_key = config.GEMINI_API_KEY if config.ENABLE_LEAN_TRANSLATION else None
-    formal_engine = FormalProofEngine(api_key=api_key, llm_name=config.DEFAULT_LLM)
+    formal_engine = FormalProofEngine(api_key=api_key, llm_name=config.DEFAULT_LLM,
+                                      verbose=getattr(config, 'VERBOSE_OUTPUT', True))
 
     proof_assistant = MathProofAssistant()
     breakthrough_detector = BreakthroughDetector()
@@ -150,7 +208,7 @@ def run_research_loop(config):
         return
     
     # Initialize memory if empty or contaminated
-    if not memory.get("facts") or len(memory.get("facts", [])) == 0:
+    if not memory.get("facts"):
         print("🔄 Initializing memory with problem-specific content...")
 
         # Ensure global axioms are persisted in the dictionary and then seed
@@ -180,7 +238,7 @@ def run_research_loop(config):
                 combined_facts.append(fact)
 
         memory["facts"] = combined_facts
-        memory["ideas"] = config.INITIAL_IDEAS.copy()
+        memory["ideas"] = list(config.INITIAL_IDEAS)
         memory_store.save(memory, category)
         print(f"✅ Initialized with {len(memory['facts'])} facts and {len(memory.get('ideas', []))} ideas (including axioms)")
     
@@ -190,8 +248,11 @@ def run_research_loop(config):
     # Main research iteration
     try:
         print("🔬 Running research iteration...")
+        # One timestamp for everything recorded during this step
+        step_timestamp = datetime.now().isoformat()
         result = run_single_research_step(memory, config, llm_manager, content_filter, 
-                                        formal_engine, proof_assistant, breakthrough_detector, quality_assessor)
+                                        formal_engine, proof_assistant, breakthrough_detector, quality_assessor,
+                                        timestamp=step_timestamp)
 
         # Check if research step failed due to LLM quota errors
         if "LLM quota/API error" in result:
@@ -221,7 +282,7 @@ def run_research_loop(config):
             memory_store.save(memory, category)
             print(f"💾 Memory saved: {len(memory.get('facts', []))} facts, {len(memory.get('ideas', []))} ideas")
             # Log the result
-            log_research_step(result, config)
+            log_research_step(result, config, step_timestamp)
             print("✅ Research iteration completed successfully!")
 
     except Exception as e:
@@ -229,55 +290,54 @@ def run_research_loop(config):
         import traceback
         traceback.print_exc()
 
+@lru_cache(maxsize=None)
+def make_validator(category) -> Callable[[str], bool]:
+    """
+    Build a contamination check specialized for one category (built once per category).
+    Returns a callable that is True when text looks like it belongs to another problem.
+    """
+    pattern = _CONTAMINATION_RE.get(category)
+    if pattern is None:
+        return lambda text: False
+
+    def is_contaminated(text: str) -> bool:
+        return pattern.search(text) is not None
+
+    return is_contaminated
+
 def validate_memory_consistency(memory, config, category):
     """Validate that memory content matches the expected problem domain"""
     
     print(f"🔍 Validating memory consistency for category: {category}...")
     
-    # Check for cross-contamination
-    domain_keywords = config.CONTENT_FILTER_CONFIG.get('domain_keywords', [])
-    wrong_domain_content = []
+    if category not in _CONTAMINATION_RE:
+        print("✅ No cross-domain indicators defined for this category, skipping check")
+        return
     
-    # Check facts for wrong domain content
-    for fact in memory.get('facts', []):
-        fact_lower = fact.lower()
-        
-        # Look for P vs NP content in non-P-vs-NP problems
-        if category == 'even_numbers':
-            pnp_indicators = ['np-complete', 'polynomial time', 'sat', 'complexity theory', 'p vs np', 'p = np']
-            if any(indicator in fact_lower for indicator in pnp_indicators):
-                wrong_domain_content.append(f"Fact: {fact[:50]}...")
-        
-        # Look for number theory content in P vs NP problems
-        elif category == 'p_vs_np':
-            number_theory_indicators = ['even number', 'odd number', '2k where k', 'divisible by 2']
-            if any(indicator in fact_lower for indicator in number_theory_indicators):
-                wrong_domain_content.append(f"Fact: {fact[:50]}...")
+    # Check facts for cross-contamination
+    is_contaminated = make_validator(category)
+    wrong_domain_content = _WRONG_DOMAIN_BUFFER
+    wrong_domain_content.clear()
+    wrong_domain_content.extend(f"Fact: {fact[:50]}..." for fact in memory.get('facts', []) if is_contaminated(fact))
     
     if wrong_domain_content:
         print(f"⚠️  WARNING: Found {len(wrong_domain_content)} potentially contaminated entries")
+        print("\n".join(["   - " + entry for entry in wrong_domain_content[:3]]))
         print("   This suggests memory file mixing between different problems.")
         print("   The unified dictionary should prevent this in future runs.")
     else:
         print("✅ Memory content appears consistent with problem domain")
+    wrong_domain_content.clear()
 
 def clean_memory_file(memory, config):
     """Clean memory file and reinitialize with correct content"""
     
-    # Keep only domain-appropriate content
-    clean_memory = {
-        "facts": config.INITIAL_FACTS.copy(),
-        "ideas": config.INITIAL_IDEAS.copy(),
-        "reflections": [],
-        "proofs": [],
-        "techniques": [],
-        "experiments": [],
-        "formal_proofs": []
-    }
-    
-    # Update the memory dict in place
+    # Keep only domain-appropriate content (list() accepts tuple or list config values)
     memory.clear()
-    memory.update(clean_memory)
+    memory["facts"] = list(config.INITIAL_FACTS)
+    memory["ideas"] = list(config.INITIAL_IDEAS)
+    for section in _EMPTY_MEMORY_SECTIONS:
+        memory[section] = []
 
 def extract_meaningful_content(generated_text: str, content_type: str) -> str:
     """
@@ -287,36 +347,25 @@ def extract_meaningful_content(generated_text: str, content_type: str) -> str:
     if not generated_text:
         return ""
     
-    lines = generated_text.strip().split('\n')
-    
-    # Filter out common prefixes that aren't useful
-    skip_patterns = [
-        "solution", "problem", "answer", "step", "example", "note", 
-        "possible rewrite", "rewrite", "question", "hint"
-    ]
-    
-    # Look for lines that contain mathematical content
-    mathematical_keywords = [
-        "even", "odd", "number", "integer", "sum", "addition", "proof", 
-        "algebra", "divisible", "remainder", "theorem", "property"
-    ]
-    
     best_line = ""
     best_score = 0
+    first_substantial = ""
     
-    for line in lines:
+    for line in generated_text.splitlines():
         line = line.strip()
         if len(line) < 10:  # Too short
             continue
-            
-        line_lower = line.lower()
+        
+        # Remember the first substantial line as a fallback
+        if not first_substantial and len(line) >= 15:
+            first_substantial = line
         
         # Skip lines that start with common prefixes
-        if any(line_lower.startswith(pattern) for pattern in skip_patterns):
+        if _SKIP_PREFIX_RE.match(line):
             continue
         
-        # Score based on mathematical content
-        score = sum(1 for keyword in mathematical_keywords if keyword in line_lower)
+        # Score based on mathematical content (distinct keywords present)
+        score = len(_MATH_KEYWORDS.intersection(_WORD_RE.findall(line.lower())))
         score += len(line) / 50  # Slight preference for longer lines
         
         if score > best_score:
@@ -324,70 +373,166 @@ def extract_meaningful_content(generated_text: str, content_type: str) -> str:
             best_line = line
     
     # If no good line found, return the first substantial line
-    if not best_line:
-        for line in lines:
-            line = line.strip()
-            if len(line) >= 15:  # At least some substance
-                return line
-    
-    return best_line
+    return best_line or first_substantial
+
+def _load_llm_cache(problem_name):
+    """Load (once) the JSONL response cache for a problem"""
+    cache = _LLM_CACHE.get(problem_name)
+    if cache is None:
+        cache = {}
+        cache_file = os.path.join(LLM_CACHE_DIR, f"{problem_name}.jsonl")
+        if os.path.exists(cache_file):
+            with open(cache_file, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Skip a torn trailing line
+                    if entry["text"] is None:
+                        cache.pop(entry["key"], None)  # Evicted by _forget_llm_response
+                    else:
+                        cache[entry["key"]] = entry["text"]
+        _LLM_CACHE[problem_name] = cache
+    return cache
+
+@lru_cache(maxsize=None)
+def _llm_error_responses():
+    """Texts the LLM backends return instead of a completion (llm_manager is imported on first use)"""
+    try:
+        from src.llm_manager import ERROR_RESPONSES
+    except ImportError:
+        from llm_manager import ERROR_RESPONSES
+    return ERROR_RESPONSES
+
+def _llm_cache_key(llm_manager, prompt, tokens):
+    """Cache key of a prompt for the manager's current model and temperature"""
+    model_name = getattr(llm_manager, 'current_model', None)
+    temperature = getattr(llm_manager, 'config', {}).get("TEMPERATURE")
+    return hashlib.sha1(f"{model_name}|{temperature}|{tokens}|{prompt}".encode("utf-8")).hexdigest()
+
+def _append_llm_cache(problem_name, entries):
+    """Append {"key", "text"} records to a problem's cache file"""
+    os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+    handle = _append_handle(os.path.join(LLM_CACHE_DIR, f"{problem_name}.jsonl"))[0]
+    handle.write("".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8"))
+    handle.flush()
+
+def _forget_llm_response(llm_manager, prompt, max_tokens, config):
+    """
+    Drop the cached response of a prompt whose output was rejected. The fact and idea
+    prompts only depend on the latest fact/idea, so a kept rejection would be replayed
+    on every following step.
+    """
+    if not getattr(config, 'ENABLE_LLM_CACHE', False):
+        return
+    key = _llm_cache_key(llm_manager, prompt, max_tokens)
+    if _load_llm_cache(config.problem_name).pop(key, None) is not None:
+        _append_llm_cache(config.problem_name, [{"key": key, "text": None}])
+
+def _llm_generate(llm_manager, prompts, max_tokens):
+    """
+    Generate for several prompts in one batched request when the manager supports it.
+    max_tokens is either one limit for all prompts or a per-prompt list.
+    """
+    limits = max_tokens if isinstance(max_tokens, list) else [max_tokens] * len(prompts)
+    if len(prompts) > 1 and hasattr(llm_manager, 'generate_batch'):
+        return llm_manager.generate_batch(prompts, max_tokens=limits)
+    return [llm_manager.generate(prompt, max_tokens=tokens) for prompt, tokens in zip(prompts, limits)]
+
+def _llm_cached_batch(llm_manager, prompts, max_tokens, config):
+    """
+    Generate text for each prompt, reusing previous responses for identical prompts when
+    config.ENABLE_LLM_CACHE is set. Keyed on model, temperature, max_tokens and prompt.
+    Cache misses are sent together and stored under the model that answered them (a
+    backend may fall back to a local model mid-call); error responses are never cached.
+    """
+    if not getattr(config, 'ENABLE_LLM_CACHE', False):
+        return _llm_generate(llm_manager, prompts, max_tokens)
+
+    limits = max_tokens if isinstance(max_tokens, list) else [max_tokens] * len(prompts)
+    keys = [_llm_cache_key(llm_manager, prompt, tokens) for prompt, tokens in zip(prompts, limits)]
+
+    cache = _load_llm_cache(config.problem_name)
+    misses = [i for i, key in enumerate(keys) if key not in cache]
+    if not misses:
+        return [cache[key] for key in keys]
+
+    texts = [cache.get(key) for key in keys]
+    generated = _llm_generate(llm_manager, [prompts[i] for i in misses], [limits[i] for i in misses])
+    new_entries = []
+    for i, text in zip(misses, generated):
+        texts[i] = text
+        if text and text not in _llm_error_responses():
+            key = _llm_cache_key(llm_manager, prompts[i], limits[i])
+            cache[key] = text
+            new_entries.append({"key": key, "text": text})
+    if new_entries:
+        _append_llm_cache(config.problem_name, new_entries)
+    return texts
+
+def _llm_cached(llm_manager, prompt, max_tokens, config):
+    """Single-prompt form of _llm_cached_batch"""
+    return _llm_cached_batch(llm_manager, [prompt], max_tokens, config)[0]
 
 def run_single_research_step(memory, config, llm_manager, content_filter, 
-                           formal_engine, proof_assistant, breakthrough_detector, quality_assessor):
-    """Run a single research step using unified configuration"""
+                           formal_engine, proof_assistant, breakthrough_detector, quality_assessor,
+                           timestamp=None):
+    """Run a single research step using unified configuration (timestamp defaults to now)"""
+    
+    facts = memory.setdefault("facts", [])
+    ideas = memory.setdefault("ideas", [])
+    formal_proofs = memory.setdefault("formal_proofs", [])
     
     # Load axioms from the unified dictionary (if present) to include in prompts
     axioms_block = ""
     try:
         from dict_manager import DictionaryManager
         dm = DictionaryManager()
-        dict_data = dm.load_dictionary()
+        dict_data = dm.load_dictionary(readonly=True)
         axioms_cat = dict_data.get("categories", {}).get("axioms", {})
         axioms_list = axioms_cat.get("facts", [])
         if axioms_list:
-            axioms_block = "\n".join([f"Axiom: {a}" for a in axioms_list[:50]])  # limit size
+            block_lines = [f"Axiom: {a}" for a in axioms_list[:50]]  # limit size
             # Include proof strategies if present (short list)
-            strategies = axioms_cat.get("proof_strategies", [])
-            if strategies:
-                strat_block = "\n".join([f"Strategy: {s}" for s in strategies[:10]])
-                axioms_block = axioms_block + "\n" + strat_block
+            block_lines.extend(f"Strategy: {s}" for s in axioms_cat.get("proof_strategies", [])[:10])
+            axioms_block = "\n".join(block_lines)
     except Exception:
         axioms_block = ""
 
     # Generate fact using problem-specific prompt (prepend axioms)
-    recent_facts = memory.get("facts", [])[-3:] if memory.get("facts") else []
-    recent_fact = recent_facts[-1] if recent_facts else "No previous facts"
+    recent_fact = facts[-1] if facts else "No previous facts"
     
-    fact_prompt = (axioms_block + "\n" + config.FACT_PROMPT.format(recent_fact=recent_fact)).strip()
-    fact_result = llm_manager.generate(fact_prompt, max_tokens=config.MAX_TOKENS)
-    fact = extract_meaningful_content(fact_result, "fact") if fact_result else None
+    fact_prompt = "\n".join((axioms_block, config.FACT_PROMPT.format(recent_fact=recent_fact))).strip()
     
     # Generate idea using problem-specific prompt  
-    recent_ideas = memory.get("ideas", [])[-3:] if memory.get("ideas") else []
-    recent_idea = recent_ideas[-1] if recent_ideas else "No previous ideas"
+    recent_idea = ideas[-1] if ideas else "No previous ideas"
     
-    idea_prompt = (axioms_block + "\n" + config.IDEA_PROMPT.format(recent_idea=recent_idea)).strip()
-    idea_result = llm_manager.generate(idea_prompt, max_tokens=config.MAX_TOKENS)
-    idea = extract_meaningful_content(idea_result, "idea") if idea_result else None
+    idea_prompt = "\n".join((axioms_block, config.IDEA_PROMPT.format(recent_idea=recent_idea))).strip()
     
-    result = f"Generated Research Step:\nFact: {fact}\nIdea: {idea}"
+    prompts = [fact_prompt, idea_prompt]
+    max_tokens = [config.MAX_TOKENS, config.MAX_TOKENS]
     
-    # Content filtering with problem-specific config
-    if fact:
-        should_keep_fact, fact_reason = content_filter.should_keep_content(fact, "fact")
-        if should_keep_fact and is_novel_content(fact, memory.get("facts", [])):
-            memory.setdefault("facts", []).append(fact)
-            print(f"✅ Added fact: {fact_reason}")
-        else:
-            print(f"❌ Rejected fact: {fact_reason}")
+    # direct_proof proves on every step, so its theorem prompt can join the batch up front
+    prefetch_theorem = config.ENABLE_FORMAL_PROOFS and config.problem_name == "direct_proof" and bool(facts)
+    if prefetch_theorem:
+        theorem_prompt, theorem_tokens = _theorem_prompt(config, recent_fact, prefix=axioms_block)
+        prompts.append(theorem_prompt)
+        max_tokens.append(theorem_tokens)
     
-    if idea:
-        should_keep_idea, idea_reason = content_filter.should_keep_content(idea, "idea")
-        if should_keep_idea and is_novel_content(idea, memory.get("ideas", [])):
-            memory.setdefault("ideas", []).append(idea)
-            print(f"✅ Added idea: {idea_reason}")
-        else:
-            print(f"❌ Rejected idea: {idea_reason}")
+    # The prompts are independent, so send them as one batch
+    fact_result, idea_result, *theorem_result = _llm_cached_batch(llm_manager, prompts, max_tokens, config)
+    # Backend error texts are not model output and must not become facts or ideas
+    error_responses = _llm_error_responses()
+    fact = extract_meaningful_content(fact_result, "fact") if fact_result not in error_responses else None
+    idea = extract_meaningful_content(idea_result, "idea") if idea_result not in error_responses else None
+    
+    result = f"Generated Research Step:\nFact: {fact}\nIdea: {idea}"
+    
+    # Content filtering with problem-specific config; a rejected response is not replayed from the cache
+    if not (fact and _accept_content(memory, "facts", fact, content_filter)):
+        _forget_llm_response(llm_manager, fact_prompt, config.MAX_TOKENS, config)
+    if not (idea and _accept_content(memory, "ideas", idea, content_filter)):
+        _forget_llm_response(llm_manager, idea_prompt, config.MAX_TOKENS, config)
     
     # Formal proof generation based on unified config
     should_generate_proofs = (
@@ -395,28 +540,57 @@ def run_single_research_step(memory, config, llm_manager, content_filter,
             # Always generate for direct_proof (even sum experiment)
             config.problem_name == "direct_proof" or
             # Or based on frequency for other problems
-            len(memory.get("facts", [])) % config.PROOF_GENERATION_FREQUENCY == 0
+            len(facts) % config.PROOF_GENERATION_FREQUENCY == 0
         )
     )
     
     if should_generate_proofs:
         print("\n=== FORMAL THEOREM GENERATION & PROVING with Quality Assessment ===")
-        proof_results = generate_formal_proofs(memory, llm_manager, formal_engine, quality_assessor, config)
+        proof_results = generate_formal_proofs(memory, llm_manager, formal_engine, quality_assessor, config,
+                                               theorem_result[0] if theorem_result else None, timestamp)
         
         # Check if proof generation failed due to LLM errors
         if isinstance(proof_results, str) and "LLM quota/API error" in proof_results:
             return proof_results  # Pass the error signal up to main loop
         
-        memory.setdefault("formal_proofs", []).extend(proof_results)
+        formal_proofs.extend(proof_results)
     
     return result
 
-def generate_formal_proofs(memory, llm_manager, formal_engine, quality_assessor, config):
-    """Generate formal proofs using unified configuration with quality assessment"""
+def _theorem_prompt(config, recent_fact, prefix=""):
+    """
+    Prompt and token limit for a new theorem (Lean code when Lean translation is enabled).
+    prefix is prepended like the axioms block of the fact/idea prompts, so batched prompts share it.
+    """
+    recent_context = "\n".join((prefix, f"Recent research: {recent_fact}")).strip()
+    if config.ENABLE_LEAN_TRANSLATION:
+        # Prompt for Lean code directly
+        if config.problem_name == "direct_proof":
+            return f"{recent_context}. Write a Lean theorem and proof about even numbers, odd numbers, or their arithmetic properties. Avoid trivial proofs.", 200
+        return f"{recent_context}. Write a Lean theorem and proof about computational complexity theory or P vs NP. Avoid trivial proofs.", 200
+    # Prompt for plain-text theorem, then translate
+    if config.problem_name == "direct_proof":
+        return f"{recent_context}. State a new theorem specifically about even numbers, odd numbers, or their arithmetic properties: ", 50
+    return f"{recent_context}. State a new theorem about computational complexity theory or P vs NP: ", 50
+
+def generate_formal_proofs(memory, llm_manager, formal_engine, quality_assessor, config, generated_theorem=None,
+                           timestamp=None):
+    """
+    Generate formal proofs using unified configuration with quality assessment.
+    generated_theorem is the LLM response to _theorem_prompt when the caller already requested it;
+    timestamp (default: now) is stamped on every proof result of this session.
+    """
+    timestamp = timestamp or datetime.now().isoformat()
+    
+    try:
+        from src.lean_feedback_parser import LeanFeedbackParser
+    except ImportError:
+        from lean_feedback_parser import LeanFeedbackParser
     
     # Generate problem-appropriate theorem statements
-    facts = memory.get("facts", [])
-    ideas = memory.get("ideas", [])
+    facts = memory.setdefault("facts", [])
+    ideas = memory.setdefault("ideas", [])
+    formal_proofs = memory.setdefault("formal_proofs", [])
     
     if config.problem_name == "direct_proof":
         # For direct_proof, focus on even number theorems
@@ -435,44 +609,42 @@ def generate_formal_proofs(memory, llm_manager, formal_engine, quality_assessor,
     
     # Use recent content to generate new theorems or Lean code
     if facts:
-        recent_context = f"Recent research: {facts[-1]}"
-        if config.ENABLE_LEAN_TRANSLATION:
-            # Prompt for Lean code directly
-            if config.problem_name == "direct_proof":
-                lean_prompt = f"{recent_context}. Write a Lean theorem and proof about even numbers, odd numbers, or their arithmetic properties. Avoid trivial proofs."
+        if generated_theorem is None:
+            theorem_prompt, theorem_tokens = _theorem_prompt(config, facts[-1])
+            generated_theorem = _llm_cached(llm_manager, theorem_prompt, theorem_tokens, config)
+        if generated_theorem in _llm_error_responses():
+            generated_theorem = None
+        if generated_theorem and config.ENABLE_LEAN_TRANSLATION:
+            theorem_templates.insert(0, generated_theorem.strip())
+        elif generated_theorem:
+            theorem_clean = generated_theorem.strip()
+            # direct_proof theorems are checked for P vs NP drift, all others for number theory drift
+            wrong_domain_re = _PNP_THEOREM_RE if config.problem_name == "direct_proof" else _NUMBER_THEORY_RE
+            if wrong_domain_re.search(theorem_clean):
+                print(f"🚫 Rejected contaminated theorem: {theorem_clean[:50]}...")
             else:
-                lean_prompt = f"{recent_context}. Write a Lean theorem and proof about computational complexity theory or P vs NP. Avoid trivial proofs."
-            generated_lean = llm_manager.generate(lean_prompt, max_tokens=200)
-            if generated_lean:
-                theorem_templates.insert(0, generated_lean.strip())
-        else:
-            # Prompt for plain-text theorem, then translate
-            if config.problem_name == "direct_proof":
-                theorem_prompt = f"{recent_context}. State a new theorem specifically about even numbers, odd numbers, or their arithmetic properties: "
-            else:
-                theorem_prompt = f"{recent_context}. State a new theorem about computational complexity theory or P vs NP: "
-            generated_theorem = llm_manager.generate(theorem_prompt, max_tokens=50)
-            if generated_theorem:
-                theorem_clean = generated_theorem.strip()
-                if config.problem_name == "direct_proof":
-                    pnp_indicators = ['polynomial time', 'np-complete', 'complexity theory', 'p vs np', 'p = np', 'reduction', 'sat problem']
-                    if any(indicator in theorem_clean.lower() for indicator in pnp_indicators):
-                        print(f"🚫 Rejected contaminated theorem: {theorem_clean[:50]}...")
-                    else:
-                        theorem_templates.insert(0, theorem_clean)
-                else:
-                    number_theory_indicators = ['even number', 'odd number', '2k where k', 'divisible by 2']
-                    if any(indicator in theorem_clean.lower() for indicator in number_theory_indicators):
-                        print(f"🚫 Rejected contaminated theorem: {theorem_clean[:50]}...")
-                    else:
-                        theorem_templates.insert(0, theorem_clean)
+                theorem_templates.insert(0, theorem_clean)
     
     proof_results = []
-    from src.lean_feedback_parser import LeanFeedbackParser
-    for theorem in theorem_templates[:2]:  # Try 2 theorems
-        print(f"\n--- Attempting: {theorem} ---")
-        proof_result = formal_engine.attempt_proof_with_translation(theorem)
-        proof_result["timestamp"] = datetime.now().isoformat()
+    context = facts[-3:]  # Use recent facts as learning context
+    theorems = theorem_templates[:2]  # Try 2 theorems
+    # Each attempt's progress lines carry its label, since the two attempts log interleaved
+    labels = [f"[{n}/{len(theorems)}] " for n in range(1, len(theorems) + 1)]
+    for label, theorem in zip(labels, theorems):
+        print(f"\n--- {label}Attempting: {theorem} ---")
+    # The attempts are independent and wait on the LLM and Lean, so run them concurrently;
+    # results are then processed (and memory updated) one at a time, in order
+    with ThreadPoolExecutor(max_workers=len(theorems)) as pool:
+        attempts = list(pool.map(
+            lambda theorem, label: formal_engine.attempt_proof_with_translation(theorem, log_prefix=label),
+            theorems, labels))
+    # Score the Lean code of every successful attempt in one batch
+    scored = [i for i, attempt in enumerate(attempts) if attempt["success"] and attempt.get("lean_code")]
+    qualities = dict(zip(scored, quality_assessor.assess_proof_quality_batch(
+        [(attempts[i]["lean_code"], theorems[i], config.problem_name) for i in scored])))
+    for i, (theorem, proof_result) in enumerate(zip(theorems, attempts)):
+        print(f"\n--- {labels[i]}Result: {theorem} ---")
+        proof_result["timestamp"] = timestamp
 
         # Check for LLM quota/API error and stop further logging if so
         err = proof_result.get('error', '')
@@ -490,11 +662,8 @@ def generate_formal_proofs(memory, llm_manager, formal_engine, quality_assessor,
             print(f"✅ Lean validation: SUCCESS")
 
             # 🎯 NEW: Quality Assessment
-            lean_code = proof_result.get("lean_code", "")
-            if lean_code:
-                quality_info = quality_assessor.assess_proof_quality(
-                    lean_code, theorem, config.problem_name
-                )
+            if i in qualities:
+                quality_info = qualities[i]
                 proof_result["quality_assessment"] = quality_info
 
                 print(f"🎯 Proof Quality: {quality_info['quality_score']:.1f}/1.0")
@@ -524,17 +693,21 @@ def generate_formal_proofs(memory, llm_manager, formal_engine, quality_assessor,
                 recommendations = parser.parse()
                 actionable = [rec for rec in recommendations if rec != "No actionable feedback detected."]
                 if actionable:
-                    memory.setdefault('ideas', []).extend(actionable)
+                    ideas.extend(actionable)
+                    # An index built later reads memory["ideas"]; one built already needs them added
+                    idea_index = memory.get("_idea_index")
+                    if idea_index is not None:
+                        for rec in actionable:
+                            idea_index.add(rec)
                     print(f"💡 Added Lean feedback to ideas: {actionable}")
 
         proof_results.append(proof_result)
 
         # 🎯 LEARN FROM THIS PROOF ATTEMPT
-        context = facts[-3:] if len(facts) >= 3 else facts  # Use recent facts as context
         formal_engine.learn_from_proof(proof_result, context)
 
         # Add successful proofs to memory for cross-validation
-        memory.setdefault('formal_proofs', []).append(proof_result)
+        formal_proofs.append(proof_result)
 
     # 📊 Generate Quality Report
     if proof_results:
@@ -555,22 +728,72 @@ def generate_formal_proofs(memory, llm_manager, formal_engine, quality_assessor,
                     print(f"   • {substance.replace('_', ' ').title()}: {count}")
     return proof_results
 
-def is_novel_content(content, existing_list):
-    """Check if content is novel (simple similarity check)"""
-    content_lower = content.lower()
-    for existing in existing_list:
-        if content_lower in existing.lower() or existing.lower() in content_lower:
-            return False
-    return True
-
-def log_research_step(result, config):
-    """Log research step with timestamp"""
-    timestamp = datetime.now().isoformat()
+def novelty_index(memory, key):
+    """
+    Return the NoveltyIndex for memory[key] (e.g. "facts" -> memory["_fact_index"]),
+    building it from the stored entries the first time a novelty check needs it.
+    Underscore keys are in-process only and are not persisted by Memory.save.
+    """
+    index_key = f"_{key[:-1]}_index"
+    index = memory.get(index_key)
+    if index is None:
+        index = NoveltyIndex()
+        for entry in memory.get(key, []):
+            index.add(entry)
+        memory[index_key] = index
+    return index
+
+def _accept_content(memory, key, content, content_filter):
+    """Append content to memory[key] ("facts" or "ideas") if it passes the filter and is novel"""
+    kind = key[:-1]
+    should_keep, reason = content_filter.should_keep_content(content, kind)
+    # The index is only built once some content passes the filter
+    if should_keep and is_novel_content(content, memory[key], novelty_index(memory, key)):
+        memory[key].append(content)
+        memory[f"_{kind}_index"].add(content)
+        print(f"✅ Added {kind}: {reason}")
+        return True
+    print(f"❌ Rejected {kind}: {reason}")
+    return False
+
+def is_novel_content(content, existing_list, index=None):
+    """
+    Check if content is novel (not a near-duplicate of an existing entry).
+    Pass a prebuilt index (see novelty_index) to avoid re-indexing existing_list.
+    """
+    if index is None:
+        index = NoveltyIndex()
+        for existing in existing_list:
+            index.add(existing)
+    return index.is_novel(content)
+
+def _append_handle(path):
+    """Cached [handle, unflushed entries] slot for an append-only file, opened on first use"""
+    slot = _LOG_HANDLES.get(path)
+    if slot is None:
+        slot = _LOG_HANDLES[path] = [open(path, "ab"), 0]
+    return slot
+
+def _close_all_logs():
+    """Flush and close every cached append handle"""
+    for handle, _ in _LOG_HANDLES.values():
+        handle.close()
+    _LOG_HANDLES.clear()
+
+atexit.register(_close_all_logs)
+
+def log_research_step(result, config, timestamp=None):
+    """Log research step with timestamp (handle opened once, flushed every LOG_FLUSH_EVERY entries)"""
+    timestamp = timestamp or datetime.now().isoformat()
     log_entry = f"\n--- Research Step logged at {timestamp} ---\n{result}\n"
     
-    log_file = f"research_log_{config.problem_name}.md"
-    with open(log_file, "a") as f:
-        f.write(log_entry)
+    slot = _append_handle(f"research_log_{config.problem_name}.md")
+    handle = slot[0]
+    handle.write(log_entry.encode("utf-8"))
+    slot[1] += 1
+    if slot[1] >= LOG_FLUSH_EVERY:
+        handle.flush()
+        slot[1] = 0
 
 if __name__ == "__main__":
     exit_code = main()
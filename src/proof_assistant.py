@@ -2,84 +2,29 @@ import sympy as sp
 from sympy import symbols, latex, simplify, solve
 from sympy.logic import satisfiable
 import re
+from dataclasses import dataclass
 
-class MathProofAssistant:
-    def __init__(self):
-        self.proof_steps = []
-        self.assumptions = []
-        self.conclusions = []
-    
-    def parse_mathematical_content(self, text):
-        """Extract mathematical expressions, proofs, and logical statements from text."""
-        math_content = {
-            "equations": [],
-            "proof_steps": [],
-            "assumptions": [],
-            "conclusions": []
-        }
-        
-        # Look for mathematical expressions (basic patterns)
-        equation_pattern = r'([a-zA-Z]\s*[=<>]\s*[a-zA-Z0-9\s\+\-\*/\(\)]+)'
-        equations = re.findall(equation_pattern, text)
-        math_content["equations"] = equations
-        
-        # Look for proof keywords
-        proof_keywords = ["prove", "proof", "assume", "therefore", "hence", "thus", "let", "suppose"]
-        for keyword in proof_keywords:
-            if keyword.lower() in text.lower():
-                # Extract sentences containing proof keywords
-                sentences = text.split('.')
-                for sentence in sentences:
-                    if keyword.lower() in sentence.lower():
-                        if keyword in ["assume", "suppose", "let"]:
-                            math_content["assumptions"].append(sentence.strip())
-                        elif keyword in ["therefore", "hence", "thus"]:
-                            math_content["conclusions"].append(sentence.strip())
-                        else:
-                            math_content["proof_steps"].append(sentence.strip())
-        
-        return math_content
-    
-    def validate_logical_structure(self, proof_text):
-        """Basic validation of proof structure."""
-        validation = {
-            "has_assumptions": "assume" in proof_text.lower() or "let" in proof_text.lower(),
-            "has_conclusions": any(word in proof_text.lower() for word in ["therefore", "hence", "thus", "qed"]),
-            "has_logical_flow": "if" in proof_text.lower() and "then" in proof_text.lower(),
-            "complexity_score": len(proof_text.split('.'))
-        }
-        return validation
-    
-    def generate_proof_skeleton(self, problem_statement):
-        """Generate a basic proof structure template."""
-        skeleton = f"""
-Proof Skeleton for: {problem_statement}
 
-1. Assumptions:
-   - [State initial assumptions]
-   
-2. Definitions:
-   - [Define key terms and concepts]
-   
-3. Main Argument:
-   - [Core reasoning steps]
-   
-4. Conclusion:
-   - [Final result]
-   
-5. Verification:
-   - [Check against known results]
-"""
-        return skeleton
-    
-    def analyze_proof_technique(self, technique_name):
-        """Provide analysis of different proof techniques."""
-        techniques = {
-            "diagonalization": {
-                "description": "A proof technique that constructs an object different from all objects in a given list",
-                "applications": ["Cantor's theorem", "Halting problem", "Hierarchy theorems"],
-                "limitations": ["Cannot resolve P vs NP due to relativization barriers"],
-                "pseudocode": """
+@dataclass(frozen=True, slots=True)
+class TechniqueInfo:
+    """Static description of a proof technique"""
+    description: str
+    applications: tuple
+    limitations: tuple
+    pseudocode: str
+
+
+def _technique_info(entry):
+    return TechniqueInfo(entry["description"], tuple(entry["applications"]),
+                         tuple(entry["limitations"]), entry["pseudocode"])
+
+# Built once at import; analyze_proof_technique hands out these shared instances
+_TECHNIQUES = {name: _technique_info(entry) for name, entry in {
+    "diagonalization": {
+        "description": "A proof technique that constructs an object different from all objects in a given list",
+        "applications": ["Cantor's theorem", "Halting problem", "Hierarchy theorems"],
+        "limitations": ["Cannot resolve P vs NP due to relativization barriers"],
+        "pseudocode": """
 def diagonalization_proof():
     # Assume we have enumeration of all objects
     objects = enumerate_all_objects()
@@ -94,12 +39,12 @@ def diagonalization_proof():
     # Conclude diagonal not in original list
     return "Contradiction: diagonal not enumerable"
 """
-            },
-            "reduction": {
-                "description": "Show problem A is at least as hard as problem B by transforming B to A",
-                "applications": ["NP-completeness proofs", "Undecidability results"],
-                "limitations": ["Only shows relative hardness, not absolute complexity"],
-                "pseudocode": """
+    },
+    "reduction": {
+        "description": "Show problem A is at least as hard as problem B by transforming B to A",
+        "applications": ["NP-completeness proofs", "Undecidability results"],
+        "limitations": ["Only shows relative hardness, not absolute complexity"],
+        "pseudocode": """
 def reduction_proof(problem_A, problem_B):
     # Define transformation from B to A
     def transform(instance_B):
@@ -114,12 +59,12 @@ def reduction_proof(problem_A, problem_B):
     
     return "B reduces to A"
 """
-            },
-            "algebraic": {
-                "description": "Uses algebraic structures and methods to analyze computational complexity",
-                "applications": ["Geometric complexity theory", "Algebraic circuit complexity", "Polynomial identity testing"],
-                "limitations": ["Requires deep algebraic knowledge", "May not capture all aspects of Boolean computation"],
-                "pseudocode": """
+    },
+    "algebraic": {
+        "description": "Uses algebraic structures and methods to analyze computational complexity",
+        "applications": ["Geometric complexity theory", "Algebraic circuit complexity", "Polynomial identity testing"],
+        "limitations": ["Requires deep algebraic knowledge", "May not capture all aspects of Boolean computation"],
+        "pseudocode": """
 def algebraic_approach():
     # Model computation as polynomial evaluation
     polynomial = construct_polynomial_from_circuit()
@@ -133,12 +78,12 @@ def algebraic_approach():
     
     return "Algebraic analysis complete"
 """
-            },
-            "geometric": {
-                "description": "Applies geometric methods and intuition to complexity theory problems",
-                "applications": ["Geometric complexity theory", "Representation theory", "Orbit-stabilizer analysis"],
-                "limitations": ["High mathematical sophistication required", "Connection to Boolean functions unclear"],
-                "pseudocode": """
+    },
+    "geometric": {
+        "description": "Applies geometric methods and intuition to complexity theory problems",
+        "applications": ["Geometric complexity theory", "Representation theory", "Orbit-stabilizer analysis"],
+        "limitations": ["High mathematical sophistication required", "Connection to Boolean functions unclear"],
+        "pseudocode": """
 def geometric_approach():
     # Embed problem in geometric space
     geometric_space = construct_embedding()
@@ -151,12 +96,12 @@ def geometric_approach():
     
     return f"Geometric separation: {separation}"
 """
-            },
-            "probabilistic": {
-                "description": "Uses probabilistic methods and randomness to analyze computational problems",
-                "applications": ["Probabilistic checkable proofs", "Derandomization", "Average-case complexity"],
-                "limitations": ["May not apply to worst-case scenarios", "Randomness assumptions may be strong"],
-                "pseudocode": """
+    },
+    "probabilistic": {
+        "description": "Uses probabilistic methods and randomness to analyze computational problems",
+        "applications": ["Probabilistic checkable proofs", "Derandomization", "Average-case complexity"],
+        "limitations": ["May not apply to worst-case scenarios", "Randomness assumptions may be strong"],
+        "pseudocode": """
 def probabilistic_approach():
     # Use probabilistic method
     for trial in range(num_trials):
@@ -169,12 +114,12 @@ def probabilistic_approach():
     probability = success_count / num_trials
     return f"Probabilistic bound: {probability}"
 """
-            },
-            "quantum": {
-                "description": "Leverages quantum computational models to understand classical complexity",
-                "applications": ["Quantum algorithms", "BQP vs P/NP relationships", "Quantum lower bounds"],
-                "limitations": ["Requires quantum computational model", "May not directly resolve classical questions"],
-                "pseudocode": """
+    },
+    "quantum": {
+        "description": "Leverages quantum computational models to understand classical complexity",
+        "applications": ["Quantum algorithms", "BQP vs P/NP relationships", "Quantum lower bounds"],
+        "limitations": ["Requires quantum computational model", "May not directly resolve classical questions"],
+        "pseudocode": """
 def quantum_approach():
     # Construct quantum circuit
     quantum_circuit = build_quantum_circuit()
@@ -188,12 +133,84 @@ def quantum_approach():
     
     return f"Quantum analysis: speedup = {advantage}"
 """
-            }
+    }
+}.items()}
+
+
+class MathProofAssistant:
+    # Basic "x = ..." / "x < ..." expressions
+    _EQ_RE = re.compile(r'([a-zA-Z]\s*[=<>]\s*[a-zA-Z0-9\s\+\-\*/\(\)]+)')
+    # All proof keywords in one alternation; the group name is the content bucket
+    _KW_RE = re.compile(
+        r'(?P<assumptions>assume|suppose|let)'
+        r'|(?P<conclusions>therefore|hence|thus)'
+        r'|(?P<proof_steps>prove|proof)',
+        re.IGNORECASE,
+    )
+
+    def __init__(self):
+        self.proof_steps = []
+        self.assumptions = []
+        self.conclusions = []
+    
+    def parse_mathematical_content(self, text):
+        """Extract mathematical expressions, proofs, and logical statements from text."""
+        math_content = {
+            "equations": [],
+            "proof_steps": [],
+            "assumptions": [],
+            "conclusions": []
         }
         
-        return techniques.get(technique_name.lower(), {
-            "description": f"Analysis for {technique_name} not available",
-            "applications": [],
-            "limitations": [],
-            "pseudocode": "# Technique analysis not implemented"
-        })
+        # Look for mathematical expressions (basic patterns)
+        math_content["equations"] = self._EQ_RE.findall(text)
+        
+        # Sort sentences containing proof keywords into buckets in a single pass
+        for sentence in text.split('.'):
+            buckets = {m.lastgroup for m in self._KW_RE.finditer(sentence)}
+            for bucket in ("assumptions", "conclusions", "proof_steps"):
+                if bucket in buckets:
+                    math_content[bucket].append(sentence.strip())
+        
+        return math_content
+    
+    def validate_logical_structure(self, proof_text):
+        """Basic validation of proof structure."""
+        text_lower = proof_text.lower()
+        validation = {
+            "has_assumptions": "assume" in text_lower or "let" in text_lower,
+            "has_conclusions": any(word in text_lower for word in ("therefore", "hence", "thus", "qed")),
+            "has_logical_flow": "if" in text_lower and "then" in text_lower,
+            "complexity_score": proof_text.count('.') + 1  # Number of '.'-separated pieces
+        }
+        return validation
+    
+    def generate_proof_skeleton(self, problem_statement):
+        """Generate a basic proof structure template."""
+        skeleton = f"""
+Proof Skeleton for: {problem_statement}
+
+1. Assumptions:
+   - [State initial assumptions]
+   
+2. Definitions:
+   - [Define key terms and concepts]
+   
+3. Main Argument:
+   - [Core reasoning steps]
+   
+4. Conclusion:
+   - [Final result]
+   
+5. Verification:
+   - [Check against known results]
+"""
+        return skeleton
+    
+    def analyze_proof_technique(self, technique_name):
+        """Provide analysis of different proof techniques."""
+        technique = _TECHNIQUES.get(technique_name.lower())
+        if technique is not None:
+            return technique
+        return TechniqueInfo(f"Analysis for {technique_name} not available", (), (),
+                             "# Technique analysis not implemented")
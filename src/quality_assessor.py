@@ -10,70 +10,260 @@ Integrates with the main PocketResearcher system to distinguish between:
 """
 
 import re
+from collections import Counter
 from typing import Dict, List, Tuple
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import numpy as np
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Plain Python fallback so the scoring stays importable and testable
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+_MAX_CACHED_ASSESSMENTS = 4096
+
+# Every lowercase keyword assess_proof_quality looks for as a plain substring
+SUBSTANCE_KEYWORDS = ("sorry", "trivial", "rfl", "norm_num", "ring", "by_cases", "obtain", "use", "exists")
+# Keywords that signal existential reasoning (unpacking or constructing witnesses)
+EXISTENTIAL_KEYWORDS = frozenset(("obtain", "use", "exists"))
+
+
+def _build_keyword_automaton(keywords):
+    """Aho-Corasick automaton over the keywords (None if pyahocorasick is unavailable)"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton(SUBSTANCE_KEYWORDS)
+
+# Assessment flag -> substance label, highest priority first
+SUBSTANCE_LABELS = (
+    ("is_sorry_proof", "placeholder"),
+    ("has_case_analysis", "logical_reasoning"),
+    ("has_existential_reasoning", "proof_construction"),
+    ("is_algebraic", "algebraic_manipulation"),
+    ("is_computational", "computational_verification"),
+    ("is_trivial_only", "trivial_proof"),
+)
+# Lowest set bit of the flag mask -> label (0: no flag set)
+_SUBSTANCE_LUT = {0: "minimal_reasoning", **{1 << bit: label for bit, (_, label) in enumerate(SUBSTANCE_LABELS)}}
+
+# Statements for which a bare 'trivial' proof is acceptable, matched in one scan
+TRIVIAL_APPROPRIATE = ("true", "1 = 1", "2 + 2 = 4", "basic arithmetic")
+_TRIVIAL_OK_RE = re.compile("|".join(re.escape(pattern) for pattern in TRIVIAL_APPROPRIATE))
+
+
+def keyword_hits(text_lower: str) -> set:
+    """The SUBSTANCE_KEYWORDS occurring in already-lowercased text"""
+    if _KEYWORD_AUTOMATON is not None:
+        # Single pass over the text for all keywords
+        return {keyword for _, keyword in _KEYWORD_AUTOMATON.iter(text_lower)}
+    return {keyword for keyword in SUBSTANCE_KEYWORDS if keyword in text_lower}
+
+
+@njit(cache=True)
+def _score_numeric(is_sorry, is_trivial_only, trivial_appropriate, meaningful_tactics,
+                   is_computational, is_algebraic, has_case_analysis, has_existential,
+                   line_count, is_even_theorem, is_complexity_theorem):
+    """Quality score from 0.0 to 1.0 computed from primitive assessment flags and counts"""
+    # Penalize placeholders heavily
+    if is_sorry:
+        return 0.0  # Sorry is never a real solution
+    
+    if is_trivial_only:
+        # Check if trivial is appropriate for the statement
+        if trivial_appropriate:
+            score = 0.4  # Valid but not sophisticated
+        else:
+            score = 0.2  # Too simple for complex statement
+    else:
+        score = 0.3  # At least not trivial
+    
+    # Reward meaningful mathematical content
+    score += 0.15 * meaningful_tactics
+    
+    # Specific technique bonuses
+    if is_computational:
+        score += 0.2  # norm_num is valid for arithmetic
+    if is_algebraic:
+        score += 0.2  # ring is sophisticated
+    if has_case_analysis:
+        score += 0.3  # by_cases shows logical reasoning
+    if has_existential:
+        score += 0.25  # obtain/use shows proof construction
+    
+    # Length bonus for substantial proofs
+    if line_count > 3:
+        score += 0.1
+    if line_count > 6:
+        score += 0.1
+    
+    # Problem context adjustments
+    if is_even_theorem:
+        # For even number proofs, computational is fine
+        if is_computational:
+            score += 0.1
+    elif is_complexity_theorem:
+        # For complexity theory, need more sophisticated reasoning
+        if has_case_analysis:
+            score += 0.2
+        elif is_trivial_only:
+            score = max(score - 0.3, 0.1)  # Penalize trivial for hard problems
+    
+    return min(score, 1.0)
+
+
+@njit(cache=True, parallel=True)
+def _score_numeric_batch(is_sorry, is_trivial_only, trivial_appropriate, meaningful_tactics,
+                         is_computational, is_algebraic, has_case_analysis, has_existential,
+                         line_count, is_even_theorem, is_complexity_theorem):
+    """_score_numeric over equal-length arrays of its arguments, one proof per thread"""
+    scores = np.empty(is_sorry.shape[0])
+    for i in prange(is_sorry.shape[0]):
+        scores[i] = _score_numeric(is_sorry[i], is_trivial_only[i], trivial_appropriate[i], meaningful_tactics[i],
+                                   is_computational[i], is_algebraic[i], has_case_analysis[i], has_existential[i],
+                                   line_count[i], is_even_theorem[i], is_complexity_theorem[i])
+    return scores
+
+
+def _score_batch(inputs: List[Tuple]) -> List[float]:
+    """Scores for a list of _score_numeric argument tuples (one parallel kernel call with Numba)"""
+    if not NUMBA_AVAILABLE or not inputs:
+        return [_score_numeric(*args) for args in inputs]
+    columns = [np.array(column) for column in zip(*inputs)]
+    return _score_numeric_batch(*columns).tolist()
+
 class ProofQualityAssessor:
     """Assesses the quality and mathematical substance of formal proofs"""
     
+    # Patterns that indicate meaningful mathematical content
+    MEANINGFUL_PATTERNS = [
+        r"induction",
+        r"cases",
+        r"ring",
+        r"norm_num",
+        r"simp.*\[.*\]",  # simp with specific tactics
+        r"rw\s*\[",       # rewrite with terms
+        r"have.*:",       # intermediate steps
+        r"show.*:",       # explicit goal statements
+        r"calc",          # calculation proofs
+        r"apply.*theorem", # applying named theorems
+        r"by_cases",      # case analysis
+        r"obtain.*:=",    # existential unpacking
+        r"use\s+",        # existential construction
+        r"left|right",    # disjunction selection
+        r"exact\s+h",     # hypothesis application
+    ]
+    # Purely literal patterns (e.g. "ring", "left|right") are plain substring tests on the
+    # lowercased proof; the rest are compiled once per process and shared by every assessor
+    _MEANINGFUL_LITERALS = [tuple(pattern.split("|")) for pattern in MEANINGFUL_PATTERNS
+                            if re.fullmatch(r"[a-z_]+(\|[a-z_]+)*", pattern)]
+    _MEANINGFUL_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in MEANINGFUL_PATTERNS
+                           if not re.fullmatch(r"[a-z_]+(\|[a-z_]+)*", pattern)]
+    
     def __init__(self):
-        # Patterns that indicate placeholder/trivial content
+        # Patterns that indicate placeholder/trivial content, looked up in the
+        # keyword hits of the lowercased proof (so "True :=" never matches, as before)
         self.placeholder_patterns = [
             "sorry", "trivial", "True :=", "rfl"
         ]
-        
-        # Patterns that indicate meaningful mathematical content
-        self.meaningful_patterns = [
-            r"induction",
-            r"cases",
-            r"ring",
-            r"norm_num",
-            r"simp.*\[.*\]",  # simp with specific tactics
-            r"rw\s*\[",       # rewrite with terms
-            r"have.*:",       # intermediate steps
-            r"show.*:",       # explicit goal statements
-            r"calc",          # calculation proofs
-            r"apply.*theorem", # applying named theorems
-            r"by_cases",      # case analysis
-            r"obtain.*:=",    # existential unpacking
-            r"use\s+",        # existential construction
-            r"left|right",    # disjunction selection
-            r"exact\s+h",     # hypothesis application
-        ]
+        self.meaningful_patterns = self.MEANINGFUL_PATTERNS
+        # Memoized assessments; repeated attempts (e.g. bare 'sorry' proofs) are common
+        self._assessments: Dict[Tuple[str, str, str], Dict] = {}
     
     def assess_proof_quality(self, proof_code: str, theorem_statement: str, 
                            problem_context: str = "") -> Dict:
-        """Assess the quality of a proof attempt"""
+        """
+        Assess the quality of a proof attempt. Results are memoized per
+        (proof, statement, context), so treat the returned dict as read-only.
+        """
+        key = (proof_code, theorem_statement, problem_context)
+        result = self._assessments.get(key)
+        if result is None:
+            if len(self._assessments) >= _MAX_CACHED_ASSESSMENTS:
+                self._assessments.clear()
+            result = self._assessments[key] = self._assess(proof_code, theorem_statement, problem_context)
+        return result
+    
+    def assess_proof_quality_batch(self, attempts: List[Tuple[str, str, str]]) -> List[Dict]:
+        """
+        Assess many (proof_code, theorem_statement, problem_context) attempts. Features are
+        extracted per proof; all new attempts are then scored in a single _score_batch call.
+        """
+        pending = [key for key in dict.fromkeys(attempts) if key not in self._assessments]
+        if pending:
+            assessments = [self._extract_assessment(proof_code) for proof_code, _, _ in pending]
+            scores = _score_batch([self._score_inputs(assessment, statement, context)
+                                   for assessment, (_, statement, context) in zip(assessments, pending)])
+            if len(self._assessments) + len(pending) > _MAX_CACHED_ASSESSMENTS:
+                self._assessments.clear()
+            for key, assessment, score in zip(pending, assessments, scores):
+                self._assessments[key] = self._build_result(assessment, score)
+        return [self._assessments[key] for key in attempts]
+    
+    def _assess(self, proof_code: str, theorem_statement: str, problem_context: str) -> Dict:
+        """Uncached assessment behind assess_proof_quality"""
+        assessment = self._extract_assessment(proof_code)
+        
+        # Calculate quality score
+        if assessment["is_sorry_proof"]:
+            quality_score = 0.0  # Sorry is never a real solution
+        else:
+            quality_score = self._calculate_quality_score(assessment, theorem_statement, problem_context)
         
-        # Basic quality indicators
-        has_placeholders = any(pattern in proof_code.lower() 
-                             for pattern in self.placeholder_patterns)
+        return self._build_result(assessment, quality_score)
+    
+    def _extract_assessment(self, proof_code: str) -> Dict:
+        """Quality indicators of a proof (all the string and regex work of an assessment)"""
+        proof_lower = proof_code.lower()
+        hits = keyword_hits(proof_lower)
         
-        meaningful_content = sum(1 for pattern in self.meaningful_patterns 
-                               if re.search(pattern, proof_code, re.IGNORECASE))
+        if "sorry" in hits:
+            # A sorry proof scores 0.0 whatever else it contains, so skip the tactic scan
+            meaningful_content = 0
+        else:
+            meaningful_content = (
+                sum(1 for words in self._MEANINGFUL_LITERALS if any(word in proof_lower for word in words)) +
+                sum(1 for regex in self._MEANINGFUL_REGEXES if regex.search(proof_code))
+            )
         
         # Specific quality checks
-        assessment = {
-            "has_placeholders": has_placeholders,
+        return {
+            "has_placeholders": not hits.isdisjoint(self.placeholder_patterns),
             "meaningful_tactics": meaningful_content,
-            "line_count": len(proof_code.split('\n')),
+            "line_count": proof_code.count('\n') + 1,
             "is_trivial_only": proof_code.strip().endswith("by trivial"),
-            "is_sorry_proof": "sorry" in proof_code.lower(),
-            "is_computational": "norm_num" in proof_code.lower(),
-            "is_algebraic": "ring" in proof_code.lower(),
-            "has_case_analysis": "by_cases" in proof_code.lower(),
-            "has_existential_reasoning": any(pattern in proof_code.lower() 
-                                           for pattern in ["obtain", "use", "exists"]),
+            "is_sorry_proof": "sorry" in hits,
+            "is_computational": "norm_num" in hits,
+            "is_algebraic": "ring" in hits,
+            "has_case_analysis": "by_cases" in hits,
+            "has_existential_reasoning": not hits.isdisjoint(EXISTENTIAL_KEYWORDS),
             "proof_length": len(proof_code.strip())
         }
-        
-        # Calculate quality score
-        quality_score = self._calculate_quality_score(assessment, theorem_statement, problem_context)
-        
+    
+    def _build_result(self, assessment: Dict, quality_score: float) -> Dict:
         return {
             "quality_score": quality_score,
             "assessment": assessment,
             "is_meaningful": quality_score > 0.5,
-            "is_placeholder": has_placeholders or quality_score < 0.3,
+            "is_placeholder": assessment["has_placeholders"] or quality_score < 0.3,
             "explanation": self._explain_quality(assessment, quality_score),
             "mathematical_substance": self._assess_mathematical_substance(assessment)
         }
@@ -81,62 +271,26 @@ class ProofQualityAssessor:
     def _calculate_quality_score(self, assessment: Dict, theorem_statement: str, 
                                problem_context: str) -> float:
         """Calculate numerical quality score from 0.0 to 1.0"""
-        
-        # Start with base score
-        score = 0.0
-        
-        # Penalize placeholders heavily
-        if assessment["is_sorry_proof"]:
-            return 0.0  # Sorry is never a real solution
-        
-        if assessment["is_trivial_only"]:
-            # Check if trivial is appropriate for the statement
-            if self._is_trivial_appropriate(theorem_statement):
-                score = 0.4  # Valid but not sophisticated
-            else:
-                score = 0.2  # Too simple for complex statement
-        else:
-            score = 0.3  # At least not trivial
-        
-        # Reward meaningful mathematical content
-        score += 0.15 * assessment["meaningful_tactics"]
-        
-        # Specific technique bonuses
-        if assessment["is_computational"]:
-            score += 0.2  # norm_num is valid for arithmetic
-        if assessment["is_algebraic"]:
-            score += 0.2  # ring is sophisticated
-        if assessment["has_case_analysis"]:
-            score += 0.3  # by_cases shows logical reasoning
-        if assessment["has_existential_reasoning"]:
-            score += 0.25  # obtain/use shows proof construction
-        
-        # Length bonus for substantial proofs
-        if assessment["line_count"] > 3:
-            score += 0.1
-        if assessment["line_count"] > 6:
-            score += 0.1
-        
-        # Problem context adjustments
-        if "even number" in theorem_statement.lower():
-            # For even number proofs, computational is fine
-            if assessment["is_computational"]:
-                score += 0.1
-        elif "p vs np" in theorem_statement.lower() or "complexity" in problem_context.lower():
-            # For complexity theory, need more sophisticated reasoning
-            if assessment["has_case_analysis"]:
-                score += 0.2
-            elif assessment["is_trivial_only"]:
-                score = max(score - 0.3, 0.1)  # Penalize trivial for hard problems
-        
-        return min(score, 1.0)
+        return _score_numeric(*self._score_inputs(assessment, theorem_statement, problem_context))
     
-    def _is_trivial_appropriate(self, theorem_statement: str) -> bool:
-        """Check if 'trivial' is an appropriate proof technique for this statement"""
-        trivial_appropriate = [
-            "true", "1 = 1", "2 + 2 = 4", "basic arithmetic"
-        ]
-        return any(pattern in theorem_statement.lower() for pattern in trivial_appropriate)
+    def _score_inputs(self, assessment: Dict, theorem_statement: str, problem_context: str) -> Tuple:
+        """_score_numeric arguments for an assessment; all string work happens here"""
+        statement_lower = theorem_statement.lower()
+        is_even_theorem = "even number" in statement_lower
+        # The context is only consulted (and lowercased) for non-even-number statements
+        is_complexity_theorem = not is_even_theorem and (
+            "p vs np" in statement_lower or "complexity" in problem_context.lower())
+        trivial_appropriate = assessment["is_trivial_only"] and self._is_trivial_appropriate(statement_lower)
+        return (
+            assessment["is_sorry_proof"], assessment["is_trivial_only"], trivial_appropriate,
+            assessment["meaningful_tactics"], assessment["is_computational"], assessment["is_algebraic"],
+            assessment["has_case_analysis"], assessment["has_existential_reasoning"], assessment["line_count"],
+            is_even_theorem, is_complexity_theorem
+        )
+    
+    def _is_trivial_appropriate(self, statement_lower: str) -> bool:
+        """Check if 'trivial' is an appropriate proof technique for this (lowercased) statement"""
+        return bool(_TRIVIAL_OK_RE.search(statement_lower))
     
     def _explain_quality(self, assessment: Dict, score: float) -> str:
         """Generate human-readable explanation of quality assessment"""
@@ -157,20 +311,11 @@ class ProofQualityAssessor:
     
     def _assess_mathematical_substance(self, assessment: Dict) -> str:
         """Categorize the type of mathematical reasoning used"""
-        if assessment["is_sorry_proof"]:
-            return "placeholder"
-        elif assessment["has_case_analysis"]:
-            return "logical_reasoning"
-        elif assessment["has_existential_reasoning"]:
-            return "proof_construction"
-        elif assessment["is_algebraic"]:
-            return "algebraic_manipulation"
-        elif assessment["is_computational"]:
-            return "computational_verification"
-        elif assessment["is_trivial_only"]:
-            return "trivial_proof"
-        else:
-            return "minimal_reasoning"
+        mask = 0
+        for bit, (flag, _) in enumerate(SUBSTANCE_LABELS):
+            mask |= bool(assessment[flag]) << bit
+        # The lowest set bit is the highest-priority flag present
+        return _SUBSTANCE_LUT[mask & -mask]
     
     def generate_quality_report(self, proof_results: List[Dict]) -> Dict:
         """Generate a summary report of proof quality across multiple attempts"""
@@ -178,26 +323,35 @@ class ProofQualityAssessor:
             return {"status": "no_proofs", "summary": "No proof attempts found"}
         
         total_attempts = len(proof_results)
-        successful_attempts = sum(1 for result in proof_results if result.get("success", False))
+        successful_attempts = 0
         
-        quality_scores = []
-        substance_types = []
+        # One pass accumulates everything the report needs
+        assessed = 0
+        total_quality = 0.0
+        max_quality = float("-inf")
+        meaningful_count = 0
+        substance_counts = Counter()
         
         for result in proof_results:
-            if result.get("success") and "quality_assessment" in result:
+            if not result.get("success", False):
+                continue
+            successful_attempts += 1
+            if "quality_assessment" in result:
                 quality = result["quality_assessment"]
-                quality_scores.append(quality["quality_score"])
-                substance_types.append(quality["mathematical_substance"])
+                score = quality["quality_score"]
+                assessed += 1
+                total_quality += score
+                max_quality = max(max_quality, score)
+                meaningful_count += score > 0.5
+                substance_counts[quality["mathematical_substance"]] += 1
         
-        if not quality_scores:
+        if not assessed:
             return {
                 "status": "no_quality_data",
                 "summary": f"{successful_attempts}/{total_attempts} proofs succeeded but no quality assessment available"
             }
         
-        avg_quality = sum(quality_scores) / len(quality_scores)
-        max_quality = max(quality_scores)
-        meaningful_count = sum(1 for score in quality_scores if score > 0.5)
+        avg_quality = total_quality / assessed
         
         return {
             "status": "complete",
@@ -206,8 +360,7 @@ class ProofQualityAssessor:
             "average_quality": avg_quality,
             "max_quality": max_quality,
             "meaningful_proofs": meaningful_count,
-            "substance_distribution": {subst: substance_types.count(subst) 
-                                     for subst in set(substance_types)},
+            "substance_distribution": dict(substance_counts),
             "summary": self._generate_summary_text(avg_quality, meaningful_count, total_attempts)
         }
     
@@ -15,6 +15,11 @@ import json
 import re
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 LEAN4_IMPORTS = "import Mathlib.Algebra.Ring.Parity\n\n"
 
 # Patterns for Lean 3 imports and lowercase even/odd
@@ -23,32 +28,34 @@ LEAN3_IMPORTS = [
     r"import data.nat.basic",
     r"import tactic"
 ]
+# One alternation removes all of them in a single scan
+_LEAN3_IMPORT_RE = re.compile("|".join(f"(?:{pat})" for pat in LEAN3_IMPORTS), re.IGNORECASE)
+
+# Duplicate Lean 4 imports: the parity import is rewritten, Mathlib.Tactic is dropped
+_DUP_LEAN4_IMPORT_RE = re.compile(r"import Mathlib.(?:(Data.Nat.Parity)|Tactic)")
+
+def _replace_dup_import(match) -> str:
+    return "import Mathlib.Algebra.Ring.Parity" if match.group(1) else ""
 
 # Fix theorem statements and proof attempts
 THEOREM_PATTERN = re.compile(r"theorem ([^(]+)\(([^)]*)\) *: *([^{:=]+) *:?=?.*")
 
-# Fix Even/Odd capitalization
-EVEN_ODD_FIX = [
-    (re.compile(r"\beven\b"), "Even"),
-    (re.compile(r"\bodd\b"), "Odd")
-]
+# Fix Even/Odd capitalization (both words in a single pass)
+EVEN_ODD_FIX = {"even": "Even", "odd": "Odd"}
+_EVEN_ODD_RE = re.compile(r"\b(even|odd)\b")
 
 
 def fix_imports(lean_code: str) -> str:
     # Remove old imports
-    for pat in LEAN3_IMPORTS:
-        lean_code = re.sub(pat, "", lean_code, flags=re.IGNORECASE)
+    lean_code = _LEAN3_IMPORT_RE.sub("", lean_code)
     # Remove duplicate new imports
-    lean_code = re.sub(r"import Mathlib.Data.Nat.Parity", "import Mathlib.Algebra.Ring.Parity", lean_code)
-    lean_code = re.sub(r"import Mathlib.Tactic", "", lean_code)
+    lean_code = _DUP_LEAN4_IMPORT_RE.sub(_replace_dup_import, lean_code)
     # Prepend correct imports
     lean_code = LEAN4_IMPORTS + lean_code.lstrip()
     return lean_code
 
 def fix_even_odd(lean_code: str) -> str:
-    for pat, repl in EVEN_ODD_FIX:
-        lean_code = pat.sub(repl, lean_code)
-    return lean_code
+    return _EVEN_ODD_RE.sub(lambda match: EVEN_ODD_FIX[match.group(1)], lean_code)
 
 def update_lean_code(lean_code: str) -> str:
     code = fix_imports(lean_code)
@@ -56,8 +63,9 @@ def update_lean_code(lean_code: str) -> str:
     return code
 
 def update_json_file(json_path: Path):
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson else json.loads(raw)
     changed = False
     for section in ["formal_proofs", "proofs"]:
         if section in data:
@@ -70,8 +78,13 @@ def update_json_file(json_path: Path):
                             entry[key] = updated
                             changed = True
     if changed:
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson:
+            # orjson writes UTF-8 unescaped, like ensure_ascii=False
+            serialized = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            serialized = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        with open(json_path, "wb") as f:
+            f.write(serialized)
         print(f"Updated: {json_path}")
     else:
         print(f"No changes needed: {json_path}")
@@ -29,5 +29,16 @@ class TestContentFilter(unittest.TestCase):
         self.assertFalse(keep)
         self.assertIn("noise", reason.lower())
 
+    def test_verdicts_are_memoized(self):
+        fact = "The sum of two even numbers is always even."
+        first = self.filter.should_keep_content(fact, "fact")
+        self.filter.calculate_mathematical_relevance = None  # Would raise if re-evaluated
+        self.assertEqual(self.filter.should_keep_content(fact, "fact"), first)
+
+    def test_count_math_keywords(self):
+        self.assertEqual(self.filter.count_math_keywords("the sum of an even and an odd number"), 4)
+        self.assertEqual(self.filter.count_math_keywords("even even even"), 1)
+        self.assertEqual(self.filter.count_math_keywords("nothing here"), 0)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,89 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+from src import dict_manager
+from src.dict_manager import DictionaryManager
+
+class TestDictionaryManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "dictionary.json")
+        data = {"categories": {
+            "axioms": {"facts": ["Peano axiom"]},
+            "even_numbers": {
+                "facts": [f"Fact {i}" for i in range(7)],
+                "ideas": ["Idea"],
+                "formal_proofs": [{"theorem_name": "even_add", "success": True, "steps": [{"theorem_name": "x"}]},
+                                  {"success": False}],
+                "solved": True,
+                "solved_timestamp": "2025-01-01T00:00:00"
+            }
+        }}
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+        self.manager = DictionaryManager(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_summarize_category(self):
+        summary = self.manager.summarize_category("even_numbers")
+        self.assertEqual(summary["facts_count"], 7)
+        self.assertEqual(summary["facts"], [f"Fact {i}" for i in range(5)])
+        self.assertEqual(summary["ideas"], ["Idea"])
+        self.assertEqual(summary["formal_proofs"], [("even_add", True), ("Unknown", False)])
+        self.assertTrue(summary["solved"])
+        self.assertIsNone(self.manager.summarize_category("missing"))
+
+    def test_show_category_lists_entries(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.manager.show_category("even_numbers")
+        text = out.getvalue()
+        self.assertIn("  1. Fact 0\n  2. Fact 1\n", text)
+        self.assertIn("  5. Fact 4\n  ... and 2 more\n", text)
+        self.assertIn("  1. ✅ even_add\n  2. ❌ Unknown\n", text)
+
+    def test_show_status_totals(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.manager.show_status()
+        text = out.getvalue()
+        for line in ("Total Categories: 2", "Solved Problems: 1", "Active Problems: 1",
+                     "Total Facts: 8", "Total Ideas: 1", "Total Formal Proofs: 2"):
+            with self.subTest(line=line):
+                self.assertIn(line + "\n", text)
+
+    def test_save_and_load_round_trip(self):
+        data = self.manager.load_dictionary()
+        data["categories"]["axioms"]["facts"].append("∀ n, n + 0 = n")
+        self.manager.save_dictionary(data)
+        self.assertEqual(self.manager.load_dictionary(), data)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_readonly_loads_share_one_parse_until_saved(self):
+        with patch.object(DictionaryManager, "_read_json", wraps=DictionaryManager._read_json) as read:
+            first = self.manager.load_dictionary(readonly=True)
+            self.assertIs(DictionaryManager(self.path).load_dictionary(readonly=True), first)
+            self.assertEqual(read.call_count, 1)
+            fresh = self.manager.load_dictionary()
+            self.assertIsNot(fresh, first)
+            fresh["categories"]["axioms"]["facts"].append("New axiom")
+            self.manager.save_dictionary(fresh)
+            reloaded = self.manager.load_dictionary(readonly=True)
+        self.assertEqual(reloaded["categories"]["axioms"]["facts"], ["Peano axiom", "New axiom"])
+        self.assertEqual(read.call_count, 3)
+
+    @unittest.skipIf(dict_manager.ijson is None, "ijson not installed")
+    def test_streamed_summary_matches_full_load(self):
+        expected = self.manager.summarize_category("even_numbers")
+        with patch.object(dict_manager, "STREAM_SUMMARY_BYTES", 0):
+            self.assertEqual(self.manager.summarize_category("even_numbers"), expected)
+            self.assertIsNone(self.manager.summarize_category("missing"))
+
+if __name__ == "__main__":
+    unittest.main()
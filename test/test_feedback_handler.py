@@ -4,9 +4,11 @@ from src.formal_proof_engine import FormalProofEngine
 
 
 class TestLeanFeedbackHandler(unittest.TestCase):
-    def setUp(self):
-        # Use a debug translator (no API key) to keep the engine lightweight for tests
-        self.engine = FormalProofEngine(api_key=None, llm_name='phi2')
+    @classmethod
+    def setUpClass(cls):
+        # Use a debug translator (no API key) to keep the engine lightweight for tests;
+        # the feedback handlers are read-only, so one engine serves every test
+        cls.engine = FormalProofEngine(api_key=None, llm_name='phi2')
 
     def test_missing_identifier_add_succ(self):
         feedback = ["Import or define missing identifier: add_succ"]
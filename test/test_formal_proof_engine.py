@@ -1,6 +1,12 @@
+import io
+import os
+import subprocess
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
 from unittest.mock import patch, MagicMock
-from src.formal_proof_engine import FormalProofEngine
+from src.formal_proof_engine import FormalProofEngine, MAX_FAILURE_PATTERNS, _lake_project_root
 
 class TestFormalProofEngine(unittest.TestCase):
     @patch('src.formal_proof_engine.FormalProofEngine.test_with_lean')
@@ -13,5 +19,107 @@ class TestFormalProofEngine(unittest.TestCase):
         self.assertTrue(result["success"])
         self.assertIn("Even.add", " ".join(result["tactics_tried"]))
 
+    def test_attempt_proof_reports_lean_contract_without_running_lean(self):
+        def lean(theorem, proof):
+            if theorem == "theorem t : 1 = 1" and proof == "by rfl":
+                return {"success": True, "error": None, "output": "ok"}
+            return {"success": False, "error": "unsolved goals", "output": ""}
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = FormalProofEngine(learning_file=os.path.join(tmp, "learning.json"), verbose=False)
+            with patch.object(FormalProofEngine, "test_with_lean", side_effect=lean) as mock_lean:
+                proved = engine.attempt_proof("theorem t : 1 = 1")
+                failed = engine.attempt_proof("theorem u : 1 = 2")
+        self.assertTrue(proved["success"])
+        self.assertEqual(proved["proof_steps"], ["rfl"])
+        self.assertEqual(proved["lean_code"], "theorem t : 1 = 1 := by rfl")
+        self.assertFalse(failed["success"])
+        self.assertEqual(failed["error"], "unsolved goals")
+        self.assertEqual(mock_lean.call_count, len(proved["tactics_tried"]) + len(failed["tactics_tried"]))
+
+    def test_concurrent_attempts_label_their_log_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = FormalProofEngine(learning_file=os.path.join(tmp, "learning.json"), verbose=False)
+
+        def attempt(statement, memory):
+            engine._log(f"working on {statement}")
+            return {"success": False}
+
+        out = io.StringIO()
+        with patch.object(engine, "_attempt_proof_with_translation", side_effect=attempt), redirect_stdout(out):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(engine.attempt_proof_with_translation, ["a", "b"], [None, None], ["[1/2] ", "[2/2] "]))
+            engine._log("done")
+        self.assertEqual(sorted(out.getvalue().splitlines()),
+                         ["[1/2] working on a", "[2/2] working on b", "done"])
+
+    def test_formal_conjectures_are_cached_across_engines(self):
+        statement = "The sum of two even numbers is even."
+        expected = "theorem The_sum_of_two_even_numbers_is_even_ (a b : ℕ) (ha : Even a) (hb : Even b) : Even (a + b)"
+        self.assertEqual(FormalProofEngine().generate_formal_conjecture(statement), expected)
+        with patch("src.formal_proof_engine.re.sub") as sub:
+            self.assertEqual(FormalProofEngine().generate_formal_conjecture(statement), expected)
+        sub.assert_not_called()
+
+    def test_learned_tactics_are_indexed_by_name(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            learning_file = os.path.join(tmp, "learning.json")
+            engine = FormalProofEngine(learning_file=learning_file)
+            success = {"success": True, "theorem": "Even (a + b)", "proof_steps": ["ring"]}
+            failure = {"success": False, "theorem": "Even (a + b)", "tactics_tried": ["ring", "simp"]}
+            engine.learn_from_proof(success, ["ctx"])
+            engine.learn_from_proof(failure, ["ctx"])
+            self.assertEqual([t["name"] for t in engine.learned_tactics], ["ring", "simp"])
+            self.assertEqual(engine.learned_tactics[0]["success_count"], 1)
+            self.assertEqual(engine.learned_tactics[0]["failure_count"], 1)
+
+            reloaded = FormalProofEngine(learning_file=learning_file)
+            reloaded.learn_from_proof(success, ["ctx"])
+            self.assertEqual(len(reloaded.learned_tactics), 2)
+            self.assertEqual(reloaded.learned_tactics[0]["success_count"], 2)
+
+    def test_failure_patterns_keep_only_the_most_recent(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            learning_file = os.path.join(tmp, "learning.json")
+            engine = FormalProofEngine(learning_file=learning_file, verbose=False)
+            out = io.StringIO()
+            with redirect_stdout(out):
+                for i in range(MAX_FAILURE_PATTERNS + 5):
+                    engine.learn_from_proof({"success": False, "theorem": f"t{i}", "tactics_tried": []}, ["ctx"])
+            self.assertEqual(out.getvalue(), "")
+            self.assertEqual(len(engine.failure_patterns), MAX_FAILURE_PATTERNS)
+
+            reloaded = FormalProofEngine(learning_file=learning_file)
+            self.assertEqual(list(reloaded.failure_patterns), list(engine.failure_patterns))
+            self.assertEqual(reloaded.failure_patterns.maxlen, MAX_FAILURE_PATTERNS)
+
+    def test_lean_verdicts_are_cached_but_timeouts_are_not(self):
+        engine = FormalProofEngine()
+        theorem = "theorem t (n : ℕ) : n + 0 = n"
+        failed = subprocess.CompletedProcess([], 1, stdout="", stderr="unknown identifier")
+        with patch("subprocess.run", return_value=failed) as run:
+            first = engine.test_with_lean(theorem, "by simp")
+            self.assertIs(engine.test_with_lean(theorem, "by simp"), first)
+            self.assertEqual(run.call_count, 1)
+            engine.test_with_lean(theorem, "by rfl")
+            self.assertEqual(run.call_count, 2)
+        self.assertIn("unknown identifier", first["error"])
+        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("lean", 10)) as run:
+            engine.test_with_lean(theorem, "by omega")
+            engine.test_with_lean(theorem, "by omega")
+            self.assertEqual(run.call_count, 2)
+
+    def test_lake_project_root_is_nearest_lakefile_directory(self):
+        with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as elsewhere:
+            root = os.path.realpath(tmp)
+            nested = os.path.join(root, "Proofs", "Even")
+            os.makedirs(nested)
+            open(os.path.join(root, "lakefile.lean"), "w").close()
+            self.assertIsNone(_lake_project_root(os.path.realpath(elsewhere)))
+            self.assertEqual(_lake_project_root(nested), root)
+            self.assertEqual(_lake_project_root(root), root)
+            # A lakefile created later in the run is picked up
+            open(os.path.join(elsewhere, "lakefile.toml"), "w").close()
+            self.assertEqual(_lake_project_root(os.path.realpath(elsewhere)), os.path.realpath(elsewhere))
+
 if __name__ == "__main__":
     unittest.main()
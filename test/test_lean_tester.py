@@ -3,33 +3,42 @@ import tempfile
 import os
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 
-def run_lean_code(lean_code: str):
+def check_lean_code(lean_code: str):
+    """Run Lean on the code in a temp file; returns (temp path, stdout, stderr)"""
     with tempfile.NamedTemporaryFile(mode='w', suffix='.lean', delete=False) as f:
         f.write(lean_code)
         temp_path = f.name
     try:
-        print(f"Running Lean on: {temp_path}\n---")
         result = subprocess.run(['lean', temp_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-        print("Lean stdout:\n", result.stdout)
-        print("Lean stderr:\n", result.stderr)
+        return temp_path, result.stdout, result.stderr
     finally:
         os.remove(temp_path)
 
+def print_lean_result(temp_path, stdout, stderr):
+    print(f"Running Lean on: {temp_path}\n---")
+    print("Lean stdout:\n", stdout)
+    print("Lean stderr:\n", stderr)
+
+def run_lean_code(lean_code: str):
+    print_lean_result(*check_lean_code(lean_code))
+
 def run_lean_from_json(json_path):
     with open(json_path, 'r') as f:
         data = json.load(f)
     formal_proofs = data.get('formal_proofs', [])
-    found = False
-    for i, proof in enumerate(formal_proofs):
-        lean_code = proof.get('lean_code', '')
-        if lean_code:
-            found = True
+    proofs = [(i, proof['lean_code']) for i, proof in enumerate(formal_proofs) if proof.get('lean_code', '')]
+    if not proofs:
+        print("No Lean code found in formal_proofs section.")
+        return
+    # Each check is a separate Lean process, so run them concurrently and report in order
+    with ThreadPoolExecutor(max_workers=min(len(proofs), os.cpu_count() or 1)) as pool:
+        results = pool.map(check_lean_code, [lean_code for _, lean_code in proofs])
+        for (i, lean_code), result in zip(proofs, results):
             print(f"\n=== Proof {i+1} ===")
             print(lean_code)
-            run_lean_code(lean_code)
-    if not found:
-        print("No Lean code found in formal_proofs section.")
+            print_lean_result(*result)
 
 def main():
     if len(sys.argv) < 2:
@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import MagicMock
-from src.lean_translator import LeanTranslator
+from src.lean_translator import LeanTranslator, truncate_for_context
 
 class TestLeanTranslator(unittest.TestCase):
     def setUp(self):
@@ -29,5 +29,12 @@ class TestLeanTranslator(unittest.TestCase):
         self.assertTrue(proof.startswith("by"))
         self.assertIn("apply Even.add", proof)
 
+    def test_truncate_for_context_keeps_most_recent(self):
+        items = ["aaaa", "bbbb", "cccc"]
+        self.assertEqual(truncate_for_context(items, 10), ["bbbb", "cccc"])
+        self.assertEqual(truncate_for_context(items, 100), items)
+        self.assertEqual(truncate_for_context(items, 2), ["cccc"])
+        self.assertEqual(truncate_for_context([], 10), [])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock
+from src import llm_manager as llm_module
+from src.llm_manager import LLMManager
+
+class TestLLMManager(unittest.TestCase):
+    @patch.object(llm_module, "REQUESTS_AVAILABLE", True)
+    @patch.object(llm_module, "requests", create=True)
+    def test_server_backend_batches_prompts_per_token_limit(self, mock_requests):
+        session = mock_requests.Session.return_value
+        session.post.return_value.json.side_effect = [
+            {"choices": [{"index": 1, "text": " idea"}, {"index": 0, "text": " fact"}]},
+            {"choices": [{"index": 0, "text": "theorem "}]},
+        ]
+        llm = LLMManager("local-server", config={"LLM_SERVER_URL": "http://server/v1/completions",
+                                                 "VERBOSE_OUTPUT": False})
+        self.assertEqual(llm.current_model, "local-server")
+        self.assertEqual(llm.get_model_info()["model_type"], "server")
+
+        texts = llm.generate_batch(["f", "i", "t"], max_tokens=[100, 100, 50])
+        self.assertEqual(texts, ["fact", "idea", "theorem"])
+        self.assertEqual(session.post.call_count, 2)
+        url = session.post.call_args_list[0].args[0]
+        payload = session.post.call_args_list[0].kwargs["json"]
+        self.assertEqual(url, "http://server/v1/completions")
+        self.assertEqual(payload["prompt"], ["f", "i"])
+        self.assertEqual(payload["max_tokens"], 100)
+        self.assertNotIn("model", payload)
+
+    @patch.object(llm_module, "REQUESTS_AVAILABLE", True)
+    @patch.object(llm_module, "requests", create=True)
+    def test_generate_async_gathers_in_prompt_order(self, mock_requests):
+        def complete(url, json, timeout):
+            response = MagicMock()
+            response.json.return_value = {"choices": [{"index": 0, "text": json["prompt"][0].upper()}]}
+            return response
+        session = mock_requests.Session.return_value
+        session.post.side_effect = complete
+        llm = LLMManager("local-server", config={"VERBOSE_OUTPUT": False})
+
+        async def ask_all(questions):
+            return await asyncio.gather(*[llm.generate_async(q, max_tokens=50) for q in questions])
+
+        self.assertEqual(asyncio.run(ask_all(["a", "b", "c"])), ["A", "B", "C"])
+        self.assertEqual(session.post.call_count, 3)
+
+    @patch.object(llm_module, "GEMINI_AVAILABLE", True)
+    @patch.object(llm_module, "genai", create=True)
+    def test_gemini_batch_respects_rate_limit(self, mock_genai):
+        mock_genai.GenerativeModel.return_value.generate_content.side_effect = lambda p: MagicMock(text=p.upper())
+        llm = LLMManager("gemini", config={"GEMINI_API_KEY": "key", "GEMINI_RATE_LIMIT": 2,
+                                           "VERBOSE_OUTPUT": False})
+        limiter = llm.rate_limiters["gemini"]
+        with patch.object(llm_module.time, "sleep", side_effect=lambda _: limiter.requests.clear()) as sleep:
+            self.assertEqual(llm.generate_batch(["a", "b", "c"], max_tokens=50), ["A", "B", "C"])
+        # Three prompts against a limit of two: exactly one wait, however the threads interleave
+        self.assertEqual(sleep.call_count, 1)
+
+    @patch.object(llm_module, "GEMINI_AVAILABLE", True)
+    @patch.object(llm_module, "genai", create=True)
+    @patch.object(llm_module, "TRANSFORMERS_AVAILABLE", True)
+    @patch.object(llm_module, "pipeline", create=True)
+    def test_gemini_batch_falls_back_to_local_model_once(self, mock_pipeline, mock_genai):
+        mock_genai.GenerativeModel.return_value.generate_content.side_effect = RuntimeError("quota")
+        mock_pipeline.return_value.return_value = [{"generated_text": " local"}]
+        llm = LLMManager("gemini", config={"GEMINI_API_KEY": "key", "LOCAL_MODELS": {"gpt2": "gpt2"},
+                                           "FALLBACK_LOCAL_MODEL": "gpt2", "VERBOSE_OUTPUT": False})
+        self.assertEqual(llm.generate_batch(["a", "b", "c"], max_tokens=50), ["local"] * 3)
+        self.assertEqual(llm.current_model, "gpt2")
+        self.assertEqual(mock_pipeline.call_count, 1)
+
+    @patch.object(llm_module, "TRANSFORMERS_AVAILABLE", True)
+    @patch.object(llm_module, "AutoModelForCausalLM", create=True)
+    @patch.object(llm_module, "pipeline", create=True)
+    def test_draft_model_only_assists_short_generations(self, mock_pipeline, mock_auto_model):
+        local_pipeline = mock_pipeline.return_value
+        local_pipeline.return_value = [{"generated_text": " text"}]
+        llm = LLMManager("gpt2", config={"LOCAL_MODELS": {"gpt2": "gpt2"}, "DRAFT_MODEL": "distilgpt2",
+                                         "VERBOSE_OUTPUT": False})
+        draft = mock_auto_model.from_pretrained.return_value
+        mock_auto_model.from_pretrained.assert_called_once_with("distilgpt2")
+
+        self.assertEqual(llm.generate("fact prompt", max_tokens=80), "text")
+        self.assertIs(local_pipeline.call_args.kwargs["assistant_model"], draft)
+        llm.generate("proof prompt", max_tokens=200)
+        self.assertNotIn("assistant_model", local_pipeline.call_args.kwargs)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,68 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock, mock_open
+from src import memory as memory_module
 from src.memory import Memory, MemoryBackend
 
 class TestMemory(unittest.TestCase):
     def setUp(self):
         self.sample_memory = {"facts": ["A fact"], "ideas": [], "reflections": [], "proofs": [], "techniques": [], "experiments": []}
 
+    @patch("os.replace")
     @patch("builtins.open", new_callable=mock_open, read_data='{"facts": ["A fact"], "ideas": [], "reflections": [], "proofs": [], "techniques": [], "experiments": []}')
     @patch("os.path.exists", return_value=True)
-    def test_file_backend_load_and_save(self, mock_exists, mock_file):
+    def test_file_backend_load_and_save(self, mock_exists, mock_file, mock_replace):
         mem = Memory(category="test_category", config={"backend": MemoryBackend.FILE, "file_path": "test_memory.json"})
         loaded = mem.load(category="test_category")
         self.assertEqual(loaded["facts"], ["A fact"])
         mem.save(self.sample_memory, category="test_category")
-        mock_file().write.assert_called()
+        mock_file().write.assert_called_once()
+        mock_replace.assert_called_once_with(mem.file_path + ".tmp", mem.file_path)
+
+    def test_file_backend_reuses_parse_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dictionary.json")
+            mem = Memory(config={"backend": MemoryBackend.FILE, "file_path": path})
+            mem.save({"categories": {"other": {"facts": ["B"]}}})
+            with patch.object(memory_module, "_loads", wraps=memory_module._loads) as loads:
+                loaded = mem.load(category="test_category")
+                loaded["facts"].append("A fact")
+                mem.save(loaded, category="test_category")
+                mem.save(loaded, category="test_category")
+                self.assertEqual(loads.call_count, 1)
+                # Another writer changes the file: it is parsed again
+                Memory(config={"backend": MemoryBackend.FILE, "file_path": path}).save({"categories": {}})
+                self.assertEqual(mem.load(category="other")["facts"], [])
+                self.assertEqual(loads.call_count, 2)
+
+    def test_file_backend_category_loads_do_not_alias_the_cached_parse(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dictionary.json")
+            mem = Memory(config={"backend": MemoryBackend.FILE, "file_path": path})
+            mem.save({"categories": {"a": {"facts": ["A"]}, "b": {"facts": ["B"]}}})
+            loaded = mem.load(category="a")
+            loaded["facts"].append("Unsaved fact")
+            loaded["_fact_index"] = object()
+            self.assertEqual(mem.load(category="a")["facts"], ["A"])
+            b = mem.load(category="b")
+            b["facts"].append("B2")
+            mem.save(b, category="b")
+            b["facts"].append("Unsaved B3")
+            mem.save({"facts": ["A", "A2"]}, category="a")
+            on_disk = Memory(config={"backend": MemoryBackend.FILE, "file_path": path}).load()
+            self.assertEqual(on_disk["categories"]["a"]["facts"], ["A", "A2"])
+            self.assertEqual(on_disk["categories"]["b"]["facts"], ["B", "B2"])
+
+    def test_memory_backend_round_trip_without_files(self):
+        mem = Memory(category="test_category", config={"backend": MemoryBackend.MEMORY})
+        with patch("builtins.open", side_effect=AssertionError("memory backend touched a file")):
+            self.assertEqual(mem.load(category="test_category")["facts"], [])
+            mem.save(dict(self.sample_memory, _fact_index=object()), category="test_category")
+            loaded = mem.load(category="test_category")
+        self.assertEqual(loaded, self.sample_memory)
+        loaded["facts"].append("Unsaved fact")
+        self.assertEqual(mem.load(category="test_category")["facts"], ["A fact"])
 
     @patch("src.memory.pymongo")
     def test_mongodb_backend_load_and_save(self, mock_pymongo):
@@ -37,7 +86,9 @@ class TestMemory(unittest.TestCase):
         loaded = mem.load(category="test_category")
         self.assertEqual(loaded["facts"], ["A fact"])
         mem.save(self.sample_memory, category="test_category")
-        mock_mc.set.assert_called()
+        key, value = mock_mc.set.call_args.args
+        self.assertEqual(key, "memory_test_category")
+        self.assertEqual(memory_module._loads(value), self.sample_memory)
 
 if __name__ == "__main__":
     unittest.main()
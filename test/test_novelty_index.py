@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+from src import novelty_index
+from src.novelty_index import BITSET_WORDS, NoveltyIndex, shingle_bitset, word_shingles
+
+class TestNoveltyIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = NoveltyIndex()
+        for fact in ["The sum of two even numbers is even.",
+                     "NP contains non-deterministic polynomial problems",
+                     "P != NP"]:
+            self.index.add(fact)
+
+    def test_word_shingles(self):
+        self.assertEqual(word_shingles("Even plus even"), {"even plus", "plus even"})
+        self.assertEqual(word_shingles("Even"), {"even"})
+
+    def test_shingle_bitset(self):
+        self.assertEqual(shingle_bitset([0, 3, 3]), 0b1001)
+        self.assertEqual(shingle_bitset([BITSET_WORDS * 64 + 1]), 0b10)
+
+    @unittest.skipIf(novelty_index.np is None, "numpy not installed")
+    def test_bulk_bitset_rows_match_shingle_bitset(self):
+        texts = ["Even plus even", "The sum of two even numbers is even.", "x"]
+        self.assertTrue(self.index.is_novel("Odd times odd is odd."))  # Builds the first three rows
+        for text in texts:
+            self.index.add(text)
+        self.index._build_rows()
+        for i, hashes in enumerate(self.index._hash_sets):
+            with self.subTest(row=i):
+                bits = shingle_bitset(hashes)
+                self.assertEqual(self.index._bitsets[i].tolist(), self.index._to_words(bits).tolist())
+                self.assertEqual(self.index._sizes[i], bin(bits).count("1"))
+
+    def test_large_index_path_gives_the_same_answers(self):
+        with patch.object(novelty_index, "KERNEL_MIN_ENTRIES", 0):
+            self.assertFalse(self.index.is_novel("the sum of two even numbers"))
+            self.assertTrue(self.index.is_novel("Odd times odd is odd."))
+
+    def test_duplicates_and_contained_text_are_not_novel(self):
+        for text in ["P != NP",
+                     "the sum of two even numbers",
+                     "The sum of two even numbers is even. Indeed it is."]:
+            with self.subTest(text=text):
+                self.assertFalse(self.index.is_novel(text))
+
+    def test_containment_across_very_different_lengths(self):
+        long_fact = ("Let a and b be even integers, so each can be written as twice an integer; "
+                     "then a + b = 2m + 2n = 2(m + n), which shows that the sum of two even integers "
+                     "is always even, and more generally parity is preserved under addition of even "
+                     "numbers, a fact used repeatedly in the induction step of later proofs.")
+        self.index.add(long_fact)
+        for text in ["the sum of two even integers is always even",
+                     "each can be written as twice an integer",
+                     "parity is preserved under addition",
+                     # A long text containing a short stored entry
+                     "As noted before, P != NP is widely believed, and most complexity theorists "
+                     "expect that no polynomial time algorithm decides SAT on every instance."]:
+            with self.subTest(text=text):
+                self.assertFalse(self.index.is_novel(text))
+        self.assertTrue(self.index.is_novel("the product of two odd integers is always odd"))
+
+    def test_exact_repeat_skips_the_sweep(self):
+        self.index._overlapping_rows = None  # Would raise if the sweep were reached
+        self.assertFalse(self.index.is_novel("the SUM of two even numbers is even ."))
+
+    def test_unrelated_text_is_novel(self):
+        for text in ["Odd times odd is odd.", "P contains polynomial time problems"]:
+            with self.subTest(text=text):
+                self.assertTrue(self.index.is_novel(text))
+        self.assertEqual(len(self.index), 3)
+
+if __name__ == "__main__":
+    unittest.main()
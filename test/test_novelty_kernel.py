@@ -0,0 +1,21 @@
+import unittest
+import numpy as np
+from src.novelty_kernel import _popcount64, max_overlap
+
+class TestNoveltyKernel(unittest.TestCase):
+    def test_popcount64(self):
+        self.assertEqual(int(_popcount64(np.uint64(0))), 0)
+        self.assertEqual(int(_popcount64(np.uint64(0b1011))), 3)
+        self.assertEqual(int(_popcount64(np.uint64(0xFFFFFFFFFFFFFFFF))), 64)
+
+    def test_max_overlap(self):
+        hist = np.array([[0b1111, 0], [0b0001, 1]], dtype=np.uint64)
+        sizes = np.array([4, 2], dtype=np.int64)
+        cand = np.array([0b0011, 0], dtype=np.uint64)
+        ids = np.array([0, 1], dtype=np.intp)
+        self.assertEqual(max_overlap(cand, 2, hist, sizes, ids), 1.0)
+        self.assertEqual(max_overlap(cand, 2, hist, sizes, ids[1:]), 0.5)
+        self.assertEqual(max_overlap(cand, 2, hist, sizes, ids[:0]), 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,27 +1,24 @@
 import unittest
-import os
 import json
+import tempfile
+from unittest.mock import MagicMock, patch
 from datetime import datetime
-from src.memory import Memory
-from src.pocketresearcher import is_novel_content
+from src.memory import Memory, MemoryBackend
+from src import pocketresearcher
+from src.pocketresearcher import is_novel_content, novelty_index
 from src.llm_manager import LLMManager
 
 class TestPocketResearcher(unittest.TestCase):
     def setUp(self):
-        self.test_memory_file = "test_memory.json"
         self.memory = {
             "facts": ["Fact 1", "Fact 2"],
             "ideas": ["Idea 1", "Idea 2"],
             "reflections": ["Reflection 1"]
         }
-        # Use test category for isolated testing
-        self.memory_store = Memory(category="test_category", config={"file_path": self.test_memory_file, "backend": "file"})
+        # Use test category in an in-process store for isolated testing
+        self.memory_store = Memory(category="test_category", config={"backend": MemoryBackend.MEMORY})
         self.memory_store.save(self.memory, category="test_category")
 
-    def tearDown(self):
-        if os.path.exists(self.test_memory_file):
-            os.remove(self.test_memory_file)
-
     def test_load_and_save_memory(self):
         loaded = self.memory_store.load(category="test_category")
         self.assertEqual(loaded, self.memory)
@@ -38,15 +35,139 @@ class TestPocketResearcher(unittest.TestCase):
         self.assertTrue(is_novel_content("P contains polynomial time problems", facts))
         self.assertFalse(is_novel_content("P != NP", facts))
 
-    def test_llm_manager_initialization(self):
-        """Test that LLM manager can be initialized"""
-        try:
-            llm_manager = LLMManager()
-            self.assertIsNotNone(llm_manager)
-            self.assertIn(llm_manager.current_model, ["gemini", "phi2", "gpt2", "gpt2-medium", "gpt2-large"])
-        except Exception as e:
-            # It's OK if initialization fails due to missing dependencies
-            self.assertIsInstance(e, (ImportError, OSError, ValueError))
+    def test_novelty_index_is_reused_and_not_persisted(self):
+        memory = {"facts": ["The sum of two even numbers is even."]}
+        index = novelty_index(memory, "facts")
+        self.assertIs(index, memory["_fact_index"])
+        self.assertFalse(is_novel_content("the sum of two even numbers", memory["facts"], index))
+        self.assertTrue(is_novel_content("Odd times odd is odd.", memory["facts"], index))
+
+        self.memory_store.save(memory, category="test_category")
+        loaded = self.memory_store.load(category="test_category")
+        self.assertNotIn("_fact_index", loaded)
+
+    def test_accept_content_filters_and_indexes_facts_and_ideas(self):
+        memory = {"facts": ["The sum of two even numbers is even."], "ideas": []}
+        content_filter = MagicMock()
+        content_filter.should_keep_content.return_value = (True, "relevant")
+        self.assertFalse(pocketresearcher._accept_content(memory, "facts", "The sum of two even numbers is even.", content_filter))
+        self.assertTrue(pocketresearcher._accept_content(memory, "ideas", "Write even numbers as 2k.", content_filter))
+        content_filter.should_keep_content.assert_called_with("Write even numbers as 2k.", "idea")
+        self.assertEqual(memory["ideas"], ["Write even numbers as 2k."])
+        self.assertFalse(memory["_idea_index"].is_novel("Write even numbers as 2k."))
+
+    def test_novelty_index_is_built_only_for_content_that_passes_the_filter(self):
+        memory = {"facts": ["The sum of two even numbers is even."], "ideas": ["Write even numbers as 2k."]}
+        content_filter = MagicMock()
+        content_filter.should_keep_content.return_value = (False, "off topic")
+        self.assertFalse(pocketresearcher._accept_content(memory, "ideas", "Try induction.", content_filter))
+        content_filter.should_keep_content.return_value = (True, "relevant")
+        self.assertTrue(pocketresearcher._accept_content(memory, "facts", "Odd times odd is odd.", content_filter))
+        self.assertNotIn("_idea_index", memory)
+        self.assertEqual(len(memory["_fact_index"]), 2)
+
+    def test_contamination_keywords_match_the_original_sets(self):
+        even_numbers = pocketresearcher.make_validator("even_numbers")
+        self.assertFalse(even_numbers("Reduction modulo p preserves parity."))
+        self.assertTrue(even_numbers("SAT solvers run in polynomial time."))
+        self.assertTrue(pocketresearcher.make_validator("p_vs_np")("Every even number is 2k where k is an integer."))
+        self.assertFalse(pocketresearcher.make_validator("direct_proof")("SAT is NP-complete."))
+        self.assertTrue(pocketresearcher._PNP_THEOREM_RE.search("theorem by reduction from 3-SAT"))
+        self.assertFalse(pocketresearcher._PNP_THEOREM_RE.search("theorem sat_even (n : ℕ) : Even (2 * n)"))
+
+    def test_contamination_validator_is_cached_per_category_not_on_config(self):
+        self.assertIs(pocketresearcher.make_validator("even_numbers"), pocketresearcher.make_validator("even_numbers"))
+        cfg = MagicMock(spec=["problem_name"], problem_name="direct_proof")
+        memory = {"facts": ["SAT is NP-complete."], "ideas": []}
+        pocketresearcher.validate_memory_consistency(memory, cfg, "even_numbers")
+        self.assertFalse(hasattr(cfg, "_contaminated"))
+
+    def test_llm_cache_reuses_identical_prompts(self):
+        llm = MagicMock(current_model="gpt2", config={"TEMPERATURE": 0.7})
+        llm.generate.return_value = "Even plus even is even."
+        cfg = MagicMock(ENABLE_LLM_CACHE=True, problem_name="test_problem")
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                patch.object(pocketresearcher, "LLM_CACHE_DIR", cache_dir), \
+                patch.dict(pocketresearcher._LLM_CACHE, clear=True):
+            first = pocketresearcher._llm_cached(llm, "prompt", 10, cfg)
+            pocketresearcher._LLM_CACHE.clear()  # Force a reload from disk
+            second = pocketresearcher._llm_cached(llm, "prompt", 10, cfg)
+            pocketresearcher._close_all_logs()
+        self.assertEqual(first, second)
+        llm.generate.assert_called_once_with("prompt", max_tokens=10)
+
+    def test_llm_cache_forgets_rejected_responses_and_keys_on_answering_model(self):
+        llm = MagicMock(current_model="gemini", config={"TEMPERATURE": 0.7})
+
+        def fall_back(prompt, max_tokens=None):
+            llm.current_model = "gpt2"
+            return f"reply {llm.generate.call_count}"
+        llm.generate.side_effect = fall_back
+        cfg = MagicMock(ENABLE_LLM_CACHE=True, problem_name="test_problem")
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                patch.object(pocketresearcher, "LLM_CACHE_DIR", cache_dir), \
+                patch.dict(pocketresearcher._LLM_CACHE, clear=True):
+            self.assertEqual(pocketresearcher._llm_cached(llm, "prompt", 10, cfg), "reply 1")
+            # Stored under the local model that answered, not the API model that was asked
+            self.assertEqual(pocketresearcher._llm_cached(llm, "prompt", 10, cfg), "reply 1")
+            llm.current_model = "gemini"
+            self.assertEqual(pocketresearcher._llm_cached(llm, "prompt", 10, cfg), "reply 2")
+            # A rejected response is dropped, also from the file
+            pocketresearcher._forget_llm_response(llm, "prompt", 10, cfg)
+            pocketresearcher._LLM_CACHE.clear()
+            self.assertEqual(pocketresearcher._llm_cached(llm, "prompt", 10, cfg), "reply 3")
+            pocketresearcher._close_all_logs()
+
+    def test_llm_cache_skips_backend_error_texts(self):
+        from src.llm_manager import ERROR_RESPONSES
+        cfg = MagicMock(ENABLE_LLM_CACHE=True, problem_name="test_problem")
+        for error in sorted(ERROR_RESPONSES):
+            llm = MagicMock(current_model="local-server", config={"TEMPERATURE": 0.7})
+            llm.generate.return_value = error
+            with self.subTest(error=error), tempfile.TemporaryDirectory() as cache_dir, \
+                    patch.object(pocketresearcher, "LLM_CACHE_DIR", cache_dir), \
+                    patch.dict(pocketresearcher._LLM_CACHE, clear=True):
+                pocketresearcher._llm_cached(llm, "prompt", 10, cfg)
+                pocketresearcher._llm_cached(llm, "prompt", 10, cfg)
+                self.assertEqual(llm.generate.call_count, 2)
+        self.assertIn("Completion server not initialized", ERROR_RESPONSES)
+
+    def test_llm_batch_with_per_prompt_token_limits(self):
+        llm = MagicMock()
+        llm.generate_batch.return_value = ["fact", "idea", "theorem"]
+        cfg = MagicMock(ENABLE_LLM_CACHE=False)
+        texts = pocketresearcher._llm_cached_batch(llm, ["f", "i", "t"], [100, 100, 50], cfg)
+        self.assertEqual(texts, ["fact", "idea", "theorem"])
+        llm.generate_batch.assert_called_once_with(["f", "i", "t"], max_tokens=[100, 100, 50])
+
+    def test_formal_proofs_are_quality_scored_in_one_batch(self):
+        from src.quality_assessor import ProofQualityAssessor
+        lean_code = "theorem t (a b : ℕ) : Even (a + a) := by\n  use a\n  ring"
+        engine = MagicMock()
+        engine.attempt_proof_with_translation.side_effect = lambda theorem, log_prefix: (
+            {"success": True, "lean_code": lean_code} if theorem.startswith("The sum")
+            else {"success": False, "error": ""})
+        assessor = ProofQualityAssessor()
+        cfg = MagicMock(problem_name="direct_proof")
+        with patch.object(assessor, "assess_proof_quality_batch", wraps=assessor.assess_proof_quality_batch) as batch:
+            results = pocketresearcher.generate_formal_proofs({}, MagicMock(), engine, assessor, cfg, timestamp="t0")
+        batch.assert_called_once_with([(lean_code, "The sum of two even numbers is even", "direct_proof")])
+        self.assertEqual(results[0]["quality_assessment"],
+                         ProofQualityAssessor().assess_proof_quality(lean_code, "The sum of two even numbers is even",
+                                                                     "direct_proof"))
+        self.assertNotIn("quality_assessment", results[1])
+
+    @patch("src.llm_manager.TRANSFORMERS_AVAILABLE", True)
+    @patch("src.llm_manager.AutoModelForCausalLM", create=True)
+    @patch("src.llm_manager.pipeline", create=True)
+    def test_llm_manager_initialization(self, mock_pipeline, mock_auto_model):
+        """Test that LLM manager can be initialized (model loading is stubbed out)"""
+        mock_pipeline.return_value.return_value = [{"generated_text": " stub"}]
+        llm_manager = LLMManager()
+        self.assertEqual(llm_manager.current_model, "gpt2-medium")
+        self.assertEqual(mock_pipeline.call_args.kwargs["model"], "gpt2-medium")
+        mock_auto_model.from_pretrained.assert_not_called()
+        self.assertEqual(llm_manager.generate("prompt"), "stub")
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,8 +2,10 @@ import unittest
 from src.proof_assistant import MathProofAssistant
 
 class TestMathProofAssistant(unittest.TestCase):
-    def setUp(self):
-        self.assistant = MathProofAssistant()
+    @classmethod
+    def setUpClass(cls):
+        # The assistant keeps no per-call state, so one instance serves every test
+        cls.assistant = MathProofAssistant()
 
     def test_parse_mathematical_content(self):
         text = "Let n be an even number. Prove that n+2 is even. Therefore, n+2 is divisible by 2."
@@ -14,6 +16,13 @@ class TestMathProofAssistant(unittest.TestCase):
         # Adjusted: Only check that equations list is present (may be empty)
         self.assertIsInstance(result["equations"], list)
 
+    def test_parse_mathematical_content_sentence_in_several_buckets(self):
+        text = "Suppose we let n = 2k, hence n is even. Proof by proving n+2 is even."
+        result = self.assistant.parse_mathematical_content(text)
+        self.assertEqual(result["assumptions"], ["Suppose we let n = 2k, hence n is even"])
+        self.assertEqual(result["conclusions"], ["Suppose we let n = 2k, hence n is even"])
+        self.assertEqual(result["proof_steps"], ["Proof by proving n+2 is even"])
+
     def test_validate_logical_structure(self):
         proof_text = "Let n be even. If n is even then n+2 is even. Therefore, n+2 is divisible by 2."
         validation = self.assistant.validate_logical_structure(proof_text)
@@ -31,11 +40,14 @@ class TestMathProofAssistant(unittest.TestCase):
 
     def test_analyze_proof_technique(self):
         analysis = self.assistant.analyze_proof_technique("reduction")
-        self.assertIn("Show problem A is at least as hard as problem B", analysis["description"])
-        self.assertIn("NP-completeness proofs", analysis["applications"])
+        self.assertIn("Show problem A is at least as hard as problem B", analysis.description)
+        self.assertIn("NP-completeness proofs", analysis.applications)
         # Adjusted: match the full limitation string
-        self.assertIn("Only shows relative hardness, not absolute complexity", analysis["limitations"])
-        self.assertIn("def reduction_proof", analysis["pseudocode"])
+        self.assertIn("Only shows relative hardness, not absolute complexity", analysis.limitations)
+        self.assertIn("def reduction_proof", analysis.pseudocode)
+        self.assertIs(analysis, self.assistant.analyze_proof_technique("Reduction"))
+        unknown = self.assistant.analyze_proof_technique("forcing")
+        self.assertEqual(unknown.applications, ())
 
 if __name__ == "__main__":
     unittest.main()
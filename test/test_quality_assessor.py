@@ -1,9 +1,17 @@
+import re
 import unittest
-from src.quality_assessor import ProofQualityAssessor
+from unittest.mock import patch
+from src import quality_assessor
+from src.quality_assessor import ProofQualityAssessor, keyword_hits
 
 class TestProofQualityAssessor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.assessor = ProofQualityAssessor()
+
     def setUp(self):
-        self.assessor = ProofQualityAssessor()
+        # Only the memoized assessments are per-test state
+        self.assessor._assessments.clear()
 
     def test_placeholder_proof(self):
         code = "theorem foo : True := by sorry"
@@ -13,6 +21,15 @@ class TestProofQualityAssessor(unittest.TestCase):
         self.assertIn("sorry", result["explanation"])
         self.assertEqual(result["mathematical_substance"], "placeholder")
 
+    def test_sorry_proof_skips_tactic_scan(self):
+        code = "theorem foo (n : ℕ) : Even (n + n) := by\n  induction n\n  ring\n  sorry"
+        with patch.object(self.assessor, "_calculate_quality_score") as score:
+            result = self.assessor.assess_proof_quality(code, "foo")
+        score.assert_not_called()
+        self.assertEqual(result["quality_score"], 0.0)
+        self.assertEqual(result["assessment"]["meaningful_tactics"], 0)
+        self.assertTrue(result["assessment"]["is_algebraic"])
+
     def test_low_quality_proof(self):
         code = "theorem foo : True := by trivial"
         result = self.assessor.assess_proof_quality(code, "foo")
@@ -29,5 +46,62 @@ class TestProofQualityAssessor(unittest.TestCase):
         self.assertIn("High-quality", result["explanation"])
         self.assertIn(result["mathematical_substance"], ["algebraic_manipulation", "proof_construction", "logical_reasoning"])
 
+    def test_trivial_proof_penalized_for_complexity_theory(self):
+        code = "theorem foo : True := by trivial"
+        result = self.assessor.assess_proof_quality(code, "foo", problem_context="complexity theory")
+        self.assertAlmostEqual(result["quality_score"], 0.1)
+        even = self.assessor.assess_proof_quality("by norm_num", "the sum of an even number and 2")
+        self.assertAlmostEqual(even["quality_score"], 0.75)
+
+    def test_assessments_are_memoized(self):
+        code = "theorem foo : True := by sorry"
+        with patch.object(self.assessor, "_assess", wraps=self.assessor._assess) as assess:
+            first = self.assessor.assess_proof_quality(code, "foo")
+            second = self.assessor.assess_proof_quality(code, "foo")
+            self.assessor.assess_proof_quality(code, "foo", problem_context="complexity")
+        self.assertIs(first, second)
+        self.assertEqual(assess.call_count, 2)
+
+    def test_meaningful_tactic_count_matches_pattern_search(self):
+        proofs = [
+            "theorem t (n : ℕ) : Even (n + n) := by\n  Induction n\n  simp [Nat.add]\n  exact h",
+            "by\n  by_cases h : n % 2 = 0\n  · left; exact h\n  · Right\n  calc n = n := rfl",
+            "by\n  have h : a = 2 * k := hk\n  rw [h]\n  obtain ⟨m, hm⟩ := hb\n  use m\n  apply add_theorem",
+        ]
+        for code in proofs:
+            with self.subTest(code=code):
+                expected = sum(1 for pattern in ProofQualityAssessor.MEANINGFUL_PATTERNS
+                               if re.search(pattern, code, re.IGNORECASE))
+                result = self.assessor.assess_proof_quality(code, "t")
+                self.assertEqual(result["assessment"]["meaningful_tactics"], expected)
+
+    def test_keyword_hits_match_plain_substring_scan(self):
+        text = "by_cases h : n % 2 = 0 <;> obtain ⟨k, hk⟩ := h <;> ring"
+        expected = {"by_cases", "obtain", "ring"}
+        self.assertEqual(keyword_hits(text), expected)
+        with patch.object(quality_assessor, "_KEYWORD_AUTOMATON", None):
+            self.assertEqual(keyword_hits(text), expected)
+
+    def test_batch_matches_single_assessments(self):
+        attempts = [
+            ("theorem foo : True := by sorry", "foo", ""),
+            ("by trivial", "P vs NP", ""),
+            ("by\n  by_cases h : n % 2 = 0\n  · left; exact h\n  · right; ring", "even number sum", ""),
+            ("by norm_num", "2 + 2 = 4", "complexity"),
+        ]
+        batch = self.assessor.assess_proof_quality_batch(attempts + attempts[:1])
+        for attempt, result in zip(attempts, batch):
+            with self.subTest(attempt=attempt):
+                self.assertEqual(result, ProofQualityAssessor().assess_proof_quality(*attempt))
+        self.assertIs(batch[-1], batch[0])
+        self.assertIs(self.assessor.assess_proof_quality(*attempts[2]), batch[2])
+
+    def test_quality_report_substance_distribution(self):
+        results = [{"success": True, "quality_assessment": {"quality_score": score, "mathematical_substance": substance}}
+                   for score, substance in [(0.9, "logical_reasoning"), (0.4, "trivial_proof"), (0.8, "logical_reasoning")]]
+        report = self.assessor.generate_quality_report(results + [{"success": False}])
+        self.assertEqual(report["substance_distribution"], {"logical_reasoning": 2, "trivial_proof": 1})
+        self.assertEqual(report["meaningful_proofs"], 2)
+
 if __name__ == "__main__":
     unittest.main()